@@ -12,10 +12,14 @@ Field: Position 20, Resident Status
   4 = Foreign residents (occurred in US, residence outside US)
 """
 
+import array
 import os
 import zipfile
 import urllib.request
-from collections import defaultdict
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from file_ranges import split_file_ranges
 
 # Same ICD-10 codes as the main processing script
 OVERDOSE_CODES = {
@@ -31,145 +35,266 @@ UNDERLYING_CAUSE_START = 145
 UNDERLYING_CAUSE_END = 149
 RECORD_AXIS_START = 343
 RECORD_AXIS_END = 443
+
+# Start of each record-axis condition (0-indexed: position 344 = index 343)
+RECORD_AXIS_STARTS = tuple(range(RECORD_AXIS_START, RECORD_AXIS_END, 5))
 STATE_OCCURRENCE_START = 20
 STATE_OCCURRENCE_END = 22
 
+# Bytes read per call when scanning the data file
+READ_BLOCK_SIZE = 1 << 24  # 16 MB
+
+# A streamed scan prints progress each time another 1/PROGRESS_STEPS of it is done
+PROGRESS_STEPS = 10
+
+# Counter slots by resident status: 1-4 as coded, 0 for blank/unknown
+NUM_STATUS_SLOTS = 5
+FOREIGN_RESIDENT = 4
+
+# Counter slot for every possible resident status byte
+RESIDENT_STATUS_SLOT = bytes(c - 0x30 if 0x31 <= c <= 0x34 else 0 for c in range(256))
+
+# State of occurrence codes for US territories (excluded from national counts)
+TERRITORY_STATES = (b'GU', b'PR', b'VI', b'AS', b'MP')
+
+
+def _build_overdose_fields():
+    """
+    Expand OVERDOSE_CODES into every 4-byte code field that qualifies.
+
+    Each 3-character code matches regardless of the fourth byte (subcategory
+    digit or blank padding), e.g. X40 yields b'X40 ', b'X400', ..., b'X409'.
+    A raw slice of the record can then be tested with one set lookup.
+    """
+    return frozenset(
+        code.encode('ascii') + bytes((fourth,))
+        for code in OVERDOSE_CODES
+        for fourth in range(256)
+    )
+
+
+OVERDOSE_FIELDS = _build_overdose_fields()
+
+
+def _build_territory_mask():
+    """Build a lookup table indexed by the two state bytes, (first << 8) | second."""
+    mask = bytearray(65536)
+    for state in TERRITORY_STATES:
+        mask[(state[0] << 8) | state[1]] = 1
+    return bytes(mask)
+
+
+TERRITORY_MASK = _build_territory_mask()
+
+
 # CDC data URLs
 US_DATA_URL = "https://ftp.cdc.gov/pub/Health_Statistics/NCHS/Datasets/DVS/mortality/mort2023us.zip"
-US_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+US_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+US_DATA_FILES = [US_DATA_DIR / f for f in ("VS23MORT.DUSMCPUB_r20241030", "VS23MORT.DUSMCPUB")]
 
 
 def download_us_data():
-    """Download US mortality data if not present."""
-    import subprocess
+    """
+    Download US mortality data if not present.
 
-    os.makedirs(US_DATA_DIR, exist_ok=True)
-    zip_path = os.path.join(US_DATA_DIR, "mort2023us.zip")
+    Returns the extracted data file if one exists, otherwise the downloaded
+    zip archive, which analyze_by_resident_status scans without extracting.
+    """
+    US_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    zip_path = US_DATA_DIR / "mort2023us.zip"
 
     # Check if extracted file exists
-    expected_files = ["VS23MORT.DUSMCPUB_r20241030", "VS23MORT.DUSMCPUB"]
-    for f in expected_files:
-        if os.path.exists(os.path.join(US_DATA_DIR, f)):
-            return os.path.join(US_DATA_DIR, f)
+    for path in US_DATA_FILES:
+        if path.exists():
+            return str(path)
 
     # Download if not exists
-    if not os.path.exists(zip_path):
+    if not zip_path.exists():
         print(f"Downloading US mortality data from {US_DATA_URL}...")
         urllib.request.urlretrieve(US_DATA_URL, zip_path)
         print("Download complete.")
 
+    return str(zip_path)
+
+
+def extract_us_data(zip_path):
+    """Extract the US mortality zip to disk and return the data file path."""
+    import subprocess
+
     # Extract using system unzip (handles more compression methods)
     print("Extracting data...")
     subprocess.run(["unzip", "-o", zip_path, "-d", US_DATA_DIR], check=True)
 
     # Find extracted file
-    for f in expected_files:
-        if os.path.exists(os.path.join(US_DATA_DIR, f)):
-            return os.path.join(US_DATA_DIR, f)
+    for path in US_DATA_FILES:
+        if path.exists():
+            return str(path)
 
     raise FileNotFoundError("Could not find extracted US mortality data file")
 
 
-def extract_icd_codes(record):
-    """Extract all ICD-10 codes from a record (underlying + multiple cause)."""
-    codes = []
+def record_is_overdose(line):
+    """
+    Check if a record has an overdose code as underlying or contributing cause.
 
+    Inspects the fields in place and returns on the first overdose code, so
+    no list of codes is built for each record. Each 4-byte code field is
+    tested with a single lookup in OVERDOSE_FIELDS.
+    """
     # Underlying cause (positions 146-149, 0-indexed: 145-148)
-    underlying = record[UNDERLYING_CAUSE_START:UNDERLYING_CAUSE_END].strip()
-    if underlying:
-        codes.append(underlying)
+    if line[UNDERLYING_CAUSE_START:UNDERLYING_CAUSE_END] in OVERDOSE_FIELDS:
+        return True
 
     # Record-axis conditions (positions 344-443)
     # From CDC docs: Number of conditions at 341-342, conditions start at 344
-    # Each condition is 5 positions (4 chars ICD + 1 blank)
-    if len(record) >= 443:
-        try:
-            num_conditions = int(record[340:342].strip() or '0')
-        except ValueError:
-            num_conditions = 0
-
-        for i in range(min(num_conditions, 20)):
-            start = 343 + (i * 5)  # 0-indexed: position 344 = index 343
-            end = start + 4
-            if end <= len(record):
-                code = record[start:end].strip()
-                if code:
-                    codes.append(code)
-
-    return codes
-
-
-def is_overdose_code(code):
-    """Check if a single ICD-10 code indicates overdose."""
-    code = code.strip().upper()
-    if len(code) < 3:
+    # Each condition is 5 positions (4 chars ICD + 1 blank). Same rule as
+    # process_mortality_data.extract_multiple_causes: honor the count (max 20)
+    # and pass over blank slots, which never match OVERDOSE_FIELDS.
+    if len(line) < RECORD_AXIS_END:
         return False
 
-    # Check X40-X44 (accidental drug poisoning)
-    if code.startswith('X4') and len(code) >= 3:
-        digit = code[2]
-        if digit in '01234':
-            return True
-
-    # Check X60-X64 (intentional self-poisoning by drugs)
-    if code.startswith('X6') and len(code) >= 3:
-        digit = code[2]
-        if digit in '01234':
-            return True
-
-    # Check X85 (assault/homicide by drugs)
-    if code.startswith('X85'):
-        return True
+    # Number of conditions (positions 341-342): " 5", "05" or "5 "; anything else is 0
+    tens = line[340]
+    ones = line[341]
+    if 0x30 <= ones <= 0x39:
+        if tens == 0x20:
+            num_conditions = ones - 0x30
+        elif 0x30 <= tens <= 0x39:
+            num_conditions = (tens - 0x30) * 10 + (ones - 0x30)
+        else:
+            num_conditions = 0
+    elif ones == 0x20 and 0x30 <= tens <= 0x39:
+        num_conditions = tens - 0x30
+    else:
+        num_conditions = 0
 
-    # Check Y10-Y14 (undetermined intent drug poisoning)
-    if code.startswith('Y1') and len(code) >= 3:
-        digit = code[2]
-        if digit in '01234':
+    for start in RECORD_AXIS_STARTS[:num_conditions]:
+        if line[start:start + 4] in OVERDOSE_FIELDS:
             return True
 
     return False
 
 
-def is_overdose(codes):
-    """Check if any ICD codes indicate overdose."""
-    for code in codes:
-        if is_overdose_code(code):
-            return True
-    return False
-
+def scan_range(data_file, start, end):
+    """
+    Count total and overdose deaths by resident status for bytes [start, end).
+
+    The range must hold whole lines (see split_file_ranges).
+    """
+    # Read raw bytes: every field of interest is ASCII, so skip latin-1 decoding
+    with open(data_file, 'rb') as f:
+        f.seek(start)
+        return scan_stream(f, end - start)
+
+
+def scan_zip(zip_path):
+    """
+    Count deaths by resident status by streaming the data file out of the zip.
+
+    A compressed zip member can only be read front to back, so this scan runs
+    in a single process rather than over parallel byte ranges, and the member
+    is inflated again on every run. That is the price of never writing the
+    ~2 GB extracted file to disk; progress is printed every 10% or so.
+    """
+    with zipfile.ZipFile(zip_path) as z:
+        names = [path.name for path in US_DATA_FILES if path.name in z.namelist()]
+        if not names:
+            raise FileNotFoundError(f"Could not find US mortality data file in {zip_path}")
+
+        info = z.getinfo(names[0])
+        # z.open raises NotImplementedError for unsupported compression, so
+        # only announce the scan once the member is open
+        with z.open(info) as f:
+            print(f"Processing {info.filename} from {zip_path}...")
+            return scan_stream(f, info.file_size, progress=True)
+
+
+def scan_stream(f, size, progress=False):
+    """
+    Count total and overdose deaths by resident status for the next size bytes of f.
+
+    f is read in READ_BLOCK_SIZE blocks and split on newlines with bytes.find,
+    instead of going through the file object's line iterator. With progress,
+    the bytes processed so far are printed every PROGRESS_STEPS-th of size.
+    """
+    total_deaths = array.array('Q', [0] * NUM_STATUS_SLOTS)  # by resident status
+    overdose_deaths = array.array('Q', [0] * NUM_STATUS_SLOTS)  # by resident status
+
+    to_read = size
+    leftover = b''
+    progress_every = max(size // PROGRESS_STEPS, 1)
+    next_progress = progress_every
+    while to_read > 0:
+        block = f.read(min(READ_BLOCK_SIZE, to_read))
+        if not block:
+            break
+        to_read -= len(block)
+
+        # Hold back a trailing partial line until the next block arrives
+        data = leftover + block
+        stop = len(data) if to_read <= 0 else data.rfind(b'\n') + 1
+        leftover = data[stop:]
+
+        pos = 0
+        while pos < stop:
+            next_pos = data.find(b'\n', pos, stop) + 1 or stop
+            line = data[pos:next_pos]
+            pos = next_pos
 
-def analyze_by_resident_status():
-    """Analyze overdose deaths by resident status."""
-    data_file = download_us_data()
-
-    # Counters
-    total_deaths = defaultdict(int)  # by resident status
-    overdose_deaths = defaultdict(int)  # by resident status
-
-    print(f"Processing {data_file}...")
-
-    with open(data_file, 'r', encoding='latin-1') as f:
-        for line_num, line in enumerate(f, 1):
             if len(line) < 400:
                 continue
 
-            # Get resident status (position 20, 0-indexed: 19)
-            resident_status = line[RESIDENT_STATUS_POS] if len(line) > RESIDENT_STATUS_POS else ''
-
-            # Only count US state deaths (not territories)
-            state = line[STATE_OCCURRENCE_START:STATE_OCCURRENCE_END].strip()
-            if state in ['GU', 'PR', 'VI', 'AS', 'MP']:
+            # Only count US state deaths (not territories); test before any other work
+            if TERRITORY_MASK[(line[STATE_OCCURRENCE_START] << 8) | line[STATE_OCCURRENCE_START + 1]]:
                 continue
 
+            # Get resident status (position 20, 0-indexed: 19) as a counter slot
+            resident_status = RESIDENT_STATUS_SLOT[line[RESIDENT_STATUS_POS]]
             total_deaths[resident_status] += 1
 
             # Check for overdose
-            codes = extract_icd_codes(line)
-            if is_overdose(codes):
+            if record_is_overdose(line):
                 overdose_deaths[resident_status] += 1
 
-            if line_num % 500000 == 0:
-                print(f"  Processed {line_num:,} records...")
+        done = size - to_read
+        if progress and done >= next_progress:
+            print(f"  Processed {done:,} of {size:,} bytes...")
+            next_progress = (done // progress_every + 1) * progress_every
+
+    return total_deaths, overdose_deaths
+
+
+def analyze_by_resident_status():
+    """Analyze overdose deaths by resident status."""
+    data_file = download_us_data()
+
+    # Scan the zip member directly rather than extracting ~2 GB and re-reading it
+    if data_file.endswith('.zip'):
+        try:
+            return scan_zip(data_file)
+        except NotImplementedError:
+            # zipfile does not support this archive's compression method
+            data_file = extract_us_data(data_file)
+
+    # Counters, indexed by resident status slot
+    total_deaths = array.array('Q', [0] * NUM_STATUS_SLOTS)
+    overdose_deaths = array.array('Q', [0] * NUM_STATUS_SLOTS)
+
+    # Records are independent, so scan line-aligned byte ranges in parallel
+    ranges = split_file_ranges(data_file, os.cpu_count() or 1)
+    print(f"Processing {data_file} in {len(ranges)} chunks...")
+
+    file_size = ranges[-1][1] if ranges else 0
+    bytes_done = 0
+    with ProcessPoolExecutor(max_workers=max(len(ranges), 1)) as executor:
+        futures = {executor.submit(scan_range, data_file, lo, hi): hi - lo for lo, hi in ranges}
+        for future in as_completed(futures):
+            range_total, range_overdose = future.result()
+            for status in range(NUM_STATUS_SLOTS):
+                total_deaths[status] += range_total[status]
+                overdose_deaths[status] += range_overdose[status]
+            bytes_done += futures[future]
+            print(f"  Processed {bytes_done:,} of {file_size:,} bytes...")
 
     return total_deaths, overdose_deaths
 
@@ -183,24 +308,24 @@ def main():
 
     total_deaths, overdose_deaths = analyze_by_resident_status()
 
-    # Resident status labels
+    # Resident status labels, by counter slot
     status_labels = {
-        '1': "Residents (same state/county)",
-        '2': "Intrastate nonresidents (same state, diff county)",
-        '3': "Interstate nonresidents (diff state, both US)",
-        '4': "Foreign residents (occurred in US, lives abroad)",
-        '': "Unknown/Missing",
+        1: "Residents (same state/county)",
+        2: "Intrastate nonresidents (same state, diff county)",
+        3: "Interstate nonresidents (diff state, both US)",
+        4: "Foreign residents (occurred in US, lives abroad)",
+        0: "Unknown/Missing",
     }
 
     print("\n" + "=" * 70)
     print("RESULTS: Total Deaths by Resident Status")
     print("=" * 70)
 
-    grand_total = sum(total_deaths.values())
-    for status in ['1', '2', '3', '4', '']:
-        count = total_deaths.get(status, 0)
+    grand_total = sum(total_deaths)
+    for status in [1, 2, 3, 4, 0]:
+        count = total_deaths[status]
         pct = (count / grand_total * 100) if grand_total > 0 else 0
-        label = status_labels.get(status, f"Status {status}")
+        label = status_labels[status]
         print(f"  {status or 'X'}: {count:>10,} ({pct:5.2f}%) - {label}")
 
     print(f"\n  TOTAL: {grand_total:>10,}")
@@ -209,11 +334,11 @@ def main():
     print("RESULTS: Overdose Deaths by Resident Status")
     print("=" * 70)
 
-    overdose_total = sum(overdose_deaths.values())
-    for status in ['1', '2', '3', '4', '']:
-        count = overdose_deaths.get(status, 0)
+    overdose_total = sum(overdose_deaths)
+    for status in [1, 2, 3, 4, 0]:
+        count = overdose_deaths[status]
         pct = (count / overdose_total * 100) if overdose_total > 0 else 0
-        label = status_labels.get(status, f"Status {status}")
+        label = status_labels[status]
         print(f"  {status or 'X'}: {count:>10,} ({pct:5.2f}%) - {label}")
 
     print(f"\n  TOTAL: {overdose_total:>10,}")
@@ -225,12 +350,12 @@ def main():
 
     cdc_wonder = 112106
     all_residents = overdose_total
-    excluding_foreign = overdose_total - overdose_deaths.get('4', 0)
+    excluding_foreign = overdose_total - overdose_deaths[FOREIGN_RESIDENT]
 
     print(f"\n  CDC WONDER:                    {cdc_wonder:>10,}")
     print(f"  Public-Use (ALL):              {all_residents:>10,} (+{(all_residents-cdc_wonder)/cdc_wonder*100:.2f}%)")
     print(f"  Public-Use (excl. foreign):    {excluding_foreign:>10,} (+{(excluding_foreign-cdc_wonder)/cdc_wonder*100:.2f}%)")
-    print(f"\n  Foreign resident overdoses:    {overdose_deaths.get('4', 0):>10,}")
+    print(f"\n  Foreign resident overdoses:    {overdose_deaths[FOREIGN_RESIDENT]:>10,}")
 
     # Total deaths comparison
     print("\n" + "=" * 70)
@@ -239,12 +364,12 @@ def main():
 
     cdc_wonder_total = 3090964
     all_total = grand_total
-    excluding_foreign_total = grand_total - total_deaths.get('4', 0)
+    excluding_foreign_total = grand_total - total_deaths[FOREIGN_RESIDENT]
 
     print(f"\n  CDC WONDER/FastStats:          {cdc_wonder_total:>10,}")
     print(f"  Public-Use (ALL):              {all_total:>10,} (+{(all_total-cdc_wonder_total)/cdc_wonder_total*100:.2f}%)")
     print(f"  Public-Use (excl. foreign):    {excluding_foreign_total:>10,} (+{(excluding_foreign_total-cdc_wonder_total)/cdc_wonder_total*100:.2f}%)")
-    print(f"\n  Foreign resident deaths:       {total_deaths.get('4', 0):>10,}")
+    print(f"\n  Foreign resident deaths:       {total_deaths[FOREIGN_RESIDENT]:>10,}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Generate all PDF outputs (summary report and methodology document),
+each in its own process.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from create_report import create_report
+from create_methodology_document import create_methodology_document
+
+# Independent builders; each writes its own file under output/
+PDF_BUILDERS = (create_report, create_methodology_document)
+
+
+def build_all():
+    """Run every PDF builder in parallel and wait for all of them."""
+    with ProcessPoolExecutor(max_workers=len(PDF_BUILDERS)) as executor:
+        futures = [executor.submit(builder) for builder in PDF_BUILDERS]
+        for future in as_completed(futures):
+            future.result()
+
+
+if __name__ == "__main__":
+    build_all()
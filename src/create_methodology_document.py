@@ -4,40 +4,51 @@ Create a comprehensive methodology document explaining how the
 US Territory mortality statistics were calculated.
 """
 
-import os
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import (
-    SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer,
-    PageBreak, Preformatted
-)
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-from datetime import datetime
-
-# Output path - relative to project root
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
-OUTPUT_FILE = os.path.join(PROJECT_ROOT, "output", "Methodology_US_Territory_Mortality_Statistics.pdf")
+import argparse
+import copy
+import functools
+import io
+from datetime import date
+from pathlib import Path
 
-def create_methodology_document():
-    """Create the methodology PDF document."""
+import output_cache
 
-    doc = SimpleDocTemplate(
-        OUTPUT_FILE,
-        pagesize=letter,
-        topMargin=0.75*inch,
-        bottomMargin=0.75*inch,
-        leftMargin=0.6*inch,
-        rightMargin=0.6*inch
-    )
+# Output path - relative to project root
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+OUTPUT_FILE = PROJECT_ROOT / "output" / "Methodology_US_Territory_Mortality_Statistics.pdf"
+
+# Document colors, turned into ReportLab colors when the styles are built
+_GREEN = '#2E8B57'
+_GREY_DARK = '#444444'
+_GREY_TEXT = '#666666'
+_GREY_LIGHT = '#F5F5F5'
+_GREY_BORDER = '#CCCCCC'
+_NOTE_BG = '#FFFACD'
+_ORANGE = '#E67E22'
+_ORANGE_LIGHT = '#FFF5EE'
+_BLUE = '#3498DB'
+_BLUE_LIGHT = '#EBF5FB'
+
+# ReportLab is imported on the first build rather than at module load, so
+# create_methodology_document() finds an up-to-date PDF without ever loading
+# it. The styles below are built once, on that first build, and each section
+# is laid out once per process (see _static_elements).
+
+
+# Only the standard PDF fonts (Helvetica, Courier) are used, and they need no
+# registration. If a TTF font is ever added, register it once here through
+# pdfmetrics.registerFont, never inside the section builders.
+@functools.lru_cache(maxsize=1)
+def _build_styles():
+    """Build the paragraph styles used throughout the document."""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 
-    elements = []
     styles = getSampleStyleSheet()
+    custom = {}
 
-    # Custom styles
-    title_style = ParagraphStyle(
+    custom['title'] = ParagraphStyle(
         'CustomTitle',
         parent=styles['Title'],
         fontSize=20,
@@ -45,25 +56,25 @@ def create_methodology_document():
         alignment=TA_CENTER,
     )
 
-    heading1_style = ParagraphStyle(
+    custom['heading1'] = ParagraphStyle(
         'Heading1Custom',
         parent=styles['Heading1'],
         fontSize=16,
         spaceBefore=20,
         spaceAfter=12,
-        textColor=colors.HexColor('#2E8B57'),
+        textColor=colors.HexColor(_GREEN),
     )
 
-    heading2_style = ParagraphStyle(
+    custom['heading2'] = ParagraphStyle(
         'Heading2Custom',
         parent=styles['Heading2'],
         fontSize=13,
         spaceBefore=15,
         spaceAfter=8,
-        textColor=colors.HexColor('#444444'),
+        textColor=colors.HexColor(_GREY_DARK),
     )
 
-    body_style = ParagraphStyle(
+    custom['body'] = ParagraphStyle(
         'BodyCustom',
         parent=styles['Normal'],
         fontSize=10,
@@ -72,13 +83,13 @@ def create_methodology_document():
         leading=14,
     )
 
-    code_style = ParagraphStyle(
+    custom['code'] = ParagraphStyle(
         'CodeCustom',
         parent=styles['Code'],
         fontSize=7.5,
         fontName='Courier',
-        backColor=colors.HexColor('#F5F5F5'),
-        borderColor=colors.HexColor('#CCCCCC'),
+        backColor=colors.HexColor(_GREY_LIGHT),
+        borderColor=colors.HexColor(_GREY_BORDER),
         borderWidth=1,
         borderPadding=5,
         leftIndent=10,
@@ -87,457 +98,135 @@ def create_methodology_document():
         leading=9,
     )
 
-    note_style = ParagraphStyle(
+    custom['note'] = ParagraphStyle(
         'NoteCustom',
         parent=styles['Normal'],
         fontSize=9,
-        textColor=colors.HexColor('#666666'),
+        textColor=colors.HexColor(_GREY_TEXT),
         leftIndent=20,
         rightIndent=20,
         spaceAfter=10,
-        backColor=colors.HexColor('#FFFACD'),
+        backColor=colors.HexColor(_NOTE_BG),
         borderPadding=10,
     )
 
     # Table cell style for wrapping text
-    cell_style = ParagraphStyle(
+    custom['cell'] = ParagraphStyle(
         'CellStyle',
         parent=styles['Normal'],
         fontSize=9,
         leading=11,
     )
 
-    # Header cell style (white text for colored backgrounds)
-    header_cell_style = ParagraphStyle(
-        'HeaderCellStyle',
-        parent=styles['Normal'],
-        fontSize=9,
-        leading=11,
-        textColor=colors.white,
+    custom['subtitle'] = ParagraphStyle(
+        'Subtitle',
+        parent=styles['Heading2'],
+        alignment=TA_CENTER,
+        fontSize=14,
     )
 
-    # =========================================================================
-    # TITLE PAGE
-    # =========================================================================
-    elements.append(Spacer(1, 1.5*inch))
-    elements.append(Paragraph("Methodology Document", title_style))
-    elements.append(Paragraph("US Territory Mortality Statistics 2023",
-                             ParagraphStyle('Subtitle', parent=styles['Heading2'],
-                                          alignment=TA_CENTER, fontSize=14)))
-    elements.append(Spacer(1, 0.5*inch))
-    elements.append(Paragraph("Drug-Related Deaths, Overdose Deaths, and Suicide Deaths<br/>for Guam, Puerto Rico, Virgin Islands, American Samoa,<br/>and Northern Mariana Islands",
-                             ParagraphStyle('SubSubtitle', parent=body_style,
-                                          alignment=TA_CENTER)))
-    elements.append(Spacer(1, 1*inch))
-    elements.append(Paragraph(f"Prepared: {datetime.now().strftime('%B %d, %Y')}",
-                             ParagraphStyle('Date', parent=body_style, alignment=TA_CENTER)))
-    elements.append(PageBreak())
-
-    # =========================================================================
-    # TABLE OF CONTENTS
-    # =========================================================================
-    elements.append(Paragraph("Table of Contents", heading1_style))
-    toc_items = [
-        "1. Overview and Request",
-        "2. Data Source",
-        "3. File Format and Layout",
-        "4. Field Definitions",
-        "5. ICD-10 Code Classifications",
-        "6. Data Processing Code",
-        "7. Results",
-        "8. Appendix: Verification",
-    ]
-    for item in toc_items:
-        elements.append(Paragraph(item, body_style))
-    elements.append(PageBreak())
-
-    # =========================================================================
-    # SECTION 1: OVERVIEW
-    # =========================================================================
-    elements.append(Paragraph("1. Overview and Request", heading1_style))
-
-    elements.append(Paragraph(
-        "This document describes the methodology used to calculate mortality statistics "
-        "for US territories using CDC Multiple Cause of Death Public Use Files. The analysis "
-        "was performed to create fact sheets for the following US territories:",
-        body_style
-    ))
-
-    territory_list = [
-        "Guam (GU)",
-        "Puerto Rico (PR)",
-        "Virgin Islands (VI)",
-        "American Samoa (AS)",
-        "Northern Mariana Islands (MP)",
-    ]
-    for t in territory_list:
-        elements.append(Paragraph(f"• {t}", ParagraphStyle('ListItem', parent=body_style, leftIndent=20)))
-
-    elements.append(Spacer(1, 10))
-    elements.append(Paragraph(
-        "The requested statistics included: (1) Drug-related deaths, (2) Overdose-related deaths, "
-        "and (3) Suicide deaths for the year 2023.",
-        body_style
-    ))
-
-    # =========================================================================
-    # SECTION 2: DATA SOURCE
-    # =========================================================================
-    elements.append(Paragraph("2. Data Source", heading1_style))
-
-    elements.append(Paragraph(
-        "The data was obtained from the CDC National Center for Health Statistics (NCHS) "
-        "Multiple Cause of Death Public Use Files. These files contain mortality data "
-        "collected from death certificates filed in the United States.",
-        body_style
-    ))
-
-    elements.append(Paragraph("2.1 Download Location", heading2_style))
-    elements.append(Paragraph(
-        "The data was downloaded from the CDC FTP server:",
-        body_style
-    ))
-    elements.append(Preformatted(
-        "URL:  https://ftp.cdc.gov/pub/Health_Statistics/NCHS/Datasets/DVS/mortality/\n"
-        "File: mort2023ps.zip\n"
-        "Unzipped file: VS23MORT.DPSMCPUB_r20241030",
-        code_style
-    ))
-
-    elements.append(Paragraph(
-        "<b>Note:</b> The CDC provides separate files for US states and US territories. "
-        "The file used (mort2023ps.zip) contains data specifically for US possessions/territories.",
-        note_style
-    ))
-
-    elements.append(Paragraph("2.2 File Characteristics", heading2_style))
-    file_chars = [
-        ["Characteristic", "Value"],
-        ["Data Year", "2023"],
-        ["File Format", "Fixed-width ASCII text"],
-        ["Record Length", "818 characters per line"],
-        ["Total Records (Territories)", "36,476"],
-        ["Encoding", "Latin-1"],
-    ]
-    file_table = Table(file_chars, colWidths=[2.5*inch, 4.3*inch])
-    file_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E8B57')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    elements.append(file_table)
-
-    elements.append(Paragraph("2.3 Documentation Reference", heading2_style))
-    elements.append(Paragraph(
-        "The file layout documentation was obtained from:",
-        body_style
-    ))
-    elements.append(Preformatted(
-        "URL: https://ftp.cdc.gov/pub/Health_Statistics/NCHS/Dataset_Documentation/\n"
-        "     DVS/mortality/2022-Mortality-Public-Use-File-Documentation.pdf\n\n"
-        "Note: The 2022 documentation applies to the 2023 file format as well.",
-        code_style
-    ))
-
-    elements.append(PageBreak())
-
-    # =========================================================================
-    # SECTION 3: FILE FORMAT
-    # =========================================================================
-    elements.append(Paragraph("3. File Format and Layout", heading1_style))
-
-    elements.append(Paragraph(
-        "The CDC mortality file uses a fixed-width format where each field occupies "
-        "specific character positions. The following table shows the key fields used "
-        "in this analysis:",
-        body_style
-    ))
-
-    elements.append(Paragraph("3.1 Key Field Positions", heading2_style))
-
-    # Use Paragraph objects for cells that need wrapping
-    field_data = [
-        [Paragraph("<b>Field Name</b>", header_cell_style),
-         Paragraph("<b>Position</b>", header_cell_style),
-         Paragraph("<b>Length</b>", header_cell_style),
-         Paragraph("<b>Description</b>", header_cell_style)],
-        [Paragraph("State of Occurrence", cell_style), "21-22", "2",
-         Paragraph("FIPS state/territory code where death occurred", cell_style)],
-        [Paragraph("State of Residence", cell_style), "29-30", "2",
-         Paragraph("FIPS state/territory code of decedent's residence", cell_style)],
-        ["Data Year", "102-105", "4", Paragraph("Year of death (e.g., 2023)", cell_style)],
-        ["Manner of Death", "107", "1", Paragraph("Code indicating manner of death (1-7)", cell_style)],
-        [Paragraph("ICD-10 Underlying Cause", cell_style), "146-149", "4",
-         Paragraph("ICD-10 code for underlying cause of death", cell_style)],
-    ]
-
-    field_table = Table(field_data, colWidths=[1.6*inch, 0.8*inch, 0.6*inch, 3.8*inch])
-    field_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E8B57')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('ALIGN', (1, 1), (2, -1), 'CENTER'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    elements.append(field_table)
-
-    elements.append(Spacer(1, 10))
-    elements.append(Paragraph(
-        "<b>Important:</b> Position numbers in the CDC documentation are 1-indexed. "
-        "When using Python (0-indexed), subtract 1 from the starting position. "
-        "For example, 'Position 21-22' in the documentation corresponds to "
-        "<font face='Courier'>line[20:22]</font> in Python.",
-        note_style
-    ))
-
-    elements.append(Paragraph("3.2 Sample Raw Data", heading2_style))
-    elements.append(Paragraph(
-        "Below is a sample record from the data file with key fields highlighted:",
-        body_style
-    ))
-    elements.append(Preformatted(
-        "Sample line (first 160 characters):\n"
-        "                    11GU010  3GU  GU010             3               GU...\n"
-        "                    ^^      ^^                                          \n"
-        "                    ||      ||                                          \n"
-        "Position:          21-22   29-30                                       \n"
-        "Field:             State   State                                       \n"
-        "                   Occur   Resid                                       \n"
-        "Value:              GU      GU                                         ",
-        code_style
-    ))
-
-    elements.append(PageBreak())
-
-    # =========================================================================
-    # SECTION 4: FIELD DEFINITIONS
-    # =========================================================================
-    elements.append(Paragraph("4. Field Definitions", heading1_style))
-
-    elements.append(Paragraph("4.1 Territory Codes", heading2_style))
-    elements.append(Paragraph(
-        "US territories are identified using 2-character FIPS codes. Statistics were "
-        "calculated based on <b>State of Occurrence</b> (position 21-22), meaning deaths "
-        "are attributed to the territory where the death occurred. This matches the CDC VSRR "
-        "(Vital Statistics Rapid Release) methodology.",
-        body_style
-    ))
-    elements.append(Spacer(1, 6))
-    elements.append(Paragraph(
-        "<b>Foreign residents are excluded</b> (resident_status = 4 at position 20) to match "
-        "CDC WONDER methodology. Foreign residents are deaths occurring in the US where the "
-        "decedent resided outside the US.",
-        body_style
-    ))
-
-    territory_codes = [
-        ["Code", "Territory", "Records in 2023 File"],
-        ["GU", "Guam", "1,183"],
-        ["PR", "Puerto Rico", "33,958"],
-        ["VI", "Virgin Islands", "750"],
-        ["AS", "American Samoa", "0 (no data)"],
-        ["MP", "Northern Mariana Islands", "232"],
-    ]
-
-    terr_table = Table(territory_codes, colWidths=[1*inch, 3*inch, 2.8*inch])
-    terr_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E8B57')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('ALIGN', (0, 0), (-1, 0), 'LEFT'),   # Header row all left
-        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),  # Data rows left by default
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),  # All cells left-aligned
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    elements.append(terr_table)
-
-    elements.append(Paragraph("4.2 Manner of Death Codes", heading2_style))
-    elements.append(Paragraph(
-        "The Manner of Death field (position 107) indicates how the death occurred:",
-        body_style
-    ))
-
-    manner_codes = [
-        ["Code", "Description"],
-        ["1", "Accident"],
-        ["2", "Suicide"],
-        ["3", "Homicide"],
-        ["4", "Pending investigation"],
-        ["5", "Could not determine"],
-        ["6", "Self-Inflicted"],
-        ["7", "Natural"],
-        ["Blank", "Not specified"],
-    ]
-
-    manner_table = Table(manner_codes, colWidths=[1*inch, 5.8*inch])
-    manner_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E8B57')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-        ('TOPPADDING', (0, 0), (-1, -1), 5),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-    ]))
-    elements.append(manner_table)
+    custom['sub_subtitle'] = ParagraphStyle(
+        'SubSubtitle',
+        parent=custom['body'],
+        alignment=TA_CENTER,
+    )
 
-    elements.append(PageBreak())
+    custom['date'] = ParagraphStyle(
+        'Date',
+        parent=custom['body'],
+        alignment=TA_CENTER,
+    )
 
-    # =========================================================================
-    # SECTION 5: ICD-10 CLASSIFICATIONS
-    # =========================================================================
-    elements.append(Paragraph("5. ICD-10 Code Classifications", heading1_style))
+    custom['list_item'] = ParagraphStyle(
+        'ListItem',
+        parent=custom['body'],
+        leftIndent=20,
+    )
 
-    elements.append(Paragraph(
-        "The International Classification of Diseases, 10th Revision (ICD-10) codes "
-        "are used to classify the underlying cause of death. The following sections "
-        "describe how each statistic was defined using ICD-10 codes.",
-        body_style
-    ))
+    custom['footer'] = ParagraphStyle(
+        'Footer',
+        parent=custom['body'],
+        alignment=TA_CENTER,
+        fontSize=9,
+    )
 
-    elements.append(Paragraph("5.1 Drug Overdose Deaths", heading2_style))
-    elements.append(Paragraph(
-        "Drug overdose deaths are identified using ICD-10 codes for poisoning by drugs, "
-        "medicaments, and biological substances. The following code ranges were used:",
-        body_style
-    ))
+    return custom
 
-    overdose_codes = [
-        [Paragraph("<b>ICD-10 Range</b>", header_cell_style),
-         Paragraph("<b>Description</b>", header_cell_style),
-         Paragraph("<b>Intent</b>", header_cell_style)],
-        ["X40-X44",
-         Paragraph("Accidental poisoning by drugs, medicaments and biological substances", cell_style),
-         "Accidental"],
-        ["X60-X64",
-         Paragraph("Intentional self-poisoning by drugs, medicaments and biological substances", cell_style),
-         Paragraph("Intentional (suicide)", cell_style)],
-        ["Y10-Y14",
-         Paragraph("Poisoning by drugs, medicaments and biological substances, undetermined intent", cell_style),
-         "Undetermined"],
-    ]
-
-    od_table = Table(overdose_codes, colWidths=[1.1*inch, 4.2*inch, 1.5*inch])
-    od_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E67E22')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#FFF5EE')]),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    elements.append(od_table)
-
-    elements.append(Paragraph("5.2 Drug-Related Deaths (Broader Definition)", heading2_style))
-    elements.append(Paragraph(
-        "Drug-related deaths include overdose deaths plus additional drug-induced causes. "
-        "This broader category captures deaths where drugs played a significant role:",
-        body_style
-    ))
 
-    drug_related_codes = [
-        [Paragraph("<b>ICD-10 Range</b>", header_cell_style),
-         Paragraph("<b>Description</b>", header_cell_style)],
-        ["X40-X44, X60-X64, Y10-Y14",
-         Paragraph("Drug overdose (as defined above)", cell_style)],
-        ["F11-F16, F18-F19",
-         Paragraph("Mental and behavioral disorders due to psychoactive substance use (excluding F10 alcohol and F17 tobacco)", cell_style)],
-        ["T36-T50",
-         Paragraph("Poisoning by drugs, medicaments and biological substances (therapeutic/accidental)", cell_style)],
-    ]
+def _header_table_style(header_color, stripe_color, font_size=10, padding=6, extra=()):
+    """Table style with a colored header row, striped body rows and a grid."""
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
 
-    dr_table = Table(drug_related_codes, colWidths=[2.2*inch, 4.6*inch])
-    dr_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E67E22')),
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(header_color)),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
         ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
         ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
         ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#FFF5EE')]),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    elements.append(dr_table)
-
-    elements.append(Paragraph("5.3 Suicide Deaths", heading2_style))
-    elements.append(Paragraph(
-        "Suicide deaths are identified using two methods:",
-        body_style
-    ))
-    elements.append(Paragraph(
-        "<b>Method 1:</b> Manner of Death code = 2 (Suicide)<br/>"
-        "<b>Method 2:</b> ICD-10 codes X60-X84 (Intentional self-harm) or U03 (Terrorism involving suicide)",
-        body_style
-    ))
-    elements.append(Paragraph(
-        "A death is counted as suicide if either condition is met.",
-        body_style
-    ))
-
-    suicide_codes = [
-        [Paragraph("<b>ICD-10 Range</b>", header_cell_style),
-         Paragraph("<b>Description</b>", header_cell_style)],
-        ["X60-X84",
-         Paragraph("Intentional self-harm (includes all methods: poisoning, hanging, firearm, etc.)", cell_style)],
-        ["U03", "Terrorism involving suicide"],
-    ]
-
-    sui_table = Table(suicide_codes, colWidths=[1.5*inch, 5.3*inch])
-    sui_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#EBF5FB')]),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    elements.append(sui_table)
-
-    elements.append(PageBreak())
-
-    # =========================================================================
-    # SECTION 6: DATA PROCESSING CODE
-    # =========================================================================
-    elements.append(Paragraph("6. Data Processing Code", heading1_style))
-
-    elements.append(Paragraph(
-        "The following Python code was used to process the CDC mortality data file. "
-        "The code reads the fixed-width file, extracts relevant fields, and calculates "
-        "statistics for each territory.",
-        body_style
-    ))
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor(stripe_color)]),
+        ('TOPPADDING', (0, 0), (-1, -1), padding),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
+        *extra,
+    ])
+
+
+@functools.lru_cache(maxsize=1)
+def _table_styles():
+    """Build the table styles shared by the tables below, by name."""
+    return {
+        'green_header': _header_table_style(_GREEN, _GREY_LIGHT),
+        'orange_header': _header_table_style(
+            _ORANGE, _ORANGE_LIGHT, font_size=9,
+            extra=[('VALIGN', (0, 0), (-1, -1), 'TOP')],
+        ),
+        'blue_header': _header_table_style(_BLUE, _BLUE_LIGHT, font_size=9),
+
+        # Green variants: centered position/length columns, tighter rows, middle-aligned cells
+        'field': _header_table_style(
+            _GREEN, _GREY_LIGHT, font_size=9,
+            extra=[('ALIGN', (1, 1), (2, -1), 'CENTER'), ('VALIGN', (0, 0), (-1, -1), 'TOP')],
+        ),
+        'manner': _header_table_style(_GREEN, _GREY_LIGHT, padding=5),
+        'results': _header_table_style(
+            _GREEN, _GREY_LIGHT,
+            extra=[('FONTSIZE', (0, 0), (-1, 0), 9), ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')],
+        ),
+
+        # The results and validation column labels only fit their columns at 9pt
+        'validation': _header_table_style(
+            _GREEN, _GREY_LIGHT,
+            extra=[('FONTSIZE', (0, 0), (-1, 0), 9)],
+        ),
+    }
+
+
+# Contents entries, by section number
+_TOC_ENTRIES = dict(enumerate((
+    "1. Overview and Request",
+    "2. Data Source",
+    "3. File Format and Layout",
+    "4. Field Definitions",
+    "5. ICD-10 Code Classifications",
+    "6. Data Processing Code",
+    "7. Results",
+    "8. Appendix: Verification",
+), start=1))
+
+# Code listings and sample record shown in the document
+_SAMPLE_RECORD_CODE = (
+    "Sample line (first 160 characters):\n"
+    "                    11GU010  3GU  GU010             3               GU...\n"
+    "                    ^^      ^^                                          \n"
+    "                    ||      ||                                          \n"
+    "Position:          21-22   29-30                                       \n"
+    "Field:             State   State                                       \n"
+    "                   Occur   Resid                                       \n"
+    "Value:              GU      GU                                         "
+)
 
-    elements.append(Paragraph("6.1 Reading the Data File", heading2_style))
-    elements.append(Preformatted(
-'''# Open and read the fixed-width data file
+_READ_FILE_CODE = '''# Open and read the fixed-width data file
 DATA_FILE = "VS23MORT.DPSMCPUB_r20241030"
 
 with open(DATA_FILE, 'r', encoding='latin-1') as f:
@@ -551,13 +240,9 @@ with open(DATA_FILE, 'r', encoding='latin-1') as f:
         manner_of_death = line[106:107]         # Position 107
         icd10_code = line[145:149].strip()      # Position 146-149
 
-        # Process record...''',
-        code_style
-    ))
+        # Process record...'''
 
-    elements.append(Paragraph("6.2 Identifying Drug Overdose Deaths", heading2_style))
-    elements.append(Preformatted(
-'''def is_drug_overdose(icd10_code):
+_IS_DRUG_OVERDOSE_CODE = '''def is_drug_overdose(icd10_code):
     """
     Check if ICD-10 code indicates drug overdose.
     Drug overdose codes:
@@ -587,13 +272,9 @@ with open(DATA_FILE, 'r', encoding='latin-1') as f:
         if digit in '01234':
             return True
 
-    return False''',
-        code_style
-    ))
+    return False'''
 
-    elements.append(Paragraph("6.3 Identifying Drug-Related Deaths", heading2_style))
-    elements.append(Preformatted(
-'''def is_drug_related(icd10_code):
+_IS_DRUG_RELATED_CODE = '''def is_drug_related(icd10_code):
     """
     Check if ICD-10 code indicates any drug-related death.
     Broader than overdose, includes:
@@ -625,15 +306,9 @@ with open(DATA_FILE, 'r', encoding='latin-1') as f:
         except ValueError:
             pass
 
-    return False''',
-        code_style
-    ))
+    return False'''
 
-    elements.append(PageBreak())
-
-    elements.append(Paragraph("6.4 Identifying Suicide Deaths", heading2_style))
-    elements.append(Preformatted(
-'''def is_suicide(manner_code, icd10_code):
+_IS_SUICIDE_CODE = '''def is_suicide(manner_code, icd10_code):
     """
     Check if death is suicide.
     - Manner of death = 2 (Suicide)
@@ -662,13 +337,9 @@ with open(DATA_FILE, 'r', encoding='latin-1') as f:
     if code.startswith('U03'):
         return True
 
-    return False''',
-        code_style
-    ))
+    return False'''
 
-    elements.append(Paragraph("6.5 Main Processing Loop", heading2_style))
-    elements.append(Preformatted(
-'''from collections import defaultdict
+_MAIN_LOOP_CODE = '''from collections import defaultdict
 
 # Territory codes
 TERRITORIES = {'GU': 'Guam', 'PR': 'Puerto Rico', 'VI': 'Virgin Islands',
@@ -705,164 +376,657 @@ with open(DATA_FILE, 'r', encoding='latin-1') as f:
             stats[state_occurrence]['drug_overdose_deaths'] += 1
 
         if is_drug_related(icd10_code):
-            stats[state_occurrence]['drug_related_deaths'] += 1''',
-        code_style
-    ))
+            stats[state_occurrence]['drug_related_deaths'] += 1'''
+
+
+# =========================================================================
+# TITLE PAGE
+# =========================================================================
+def _title_page():
+    """Title page up to its date line."""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer
+
+    styles = _build_styles()
+    return [
+        Spacer(1, 1.5*inch),
+        Paragraph("Methodology Document", styles['title']),
+        Paragraph("US Territory Mortality Statistics 2023", styles['subtitle']),
+        Spacer(1, 0.5*inch),
+        Paragraph(
+            "Drug-Related Deaths, Overdose Deaths, and Suicide Deaths<br/>for Guam, Puerto Rico, "
+            "Virgin Islands, American Samoa,<br/>and Northern Mariana Islands",
+            styles['sub_subtitle'],
+        ),
+        Spacer(1, 1*inch),
+    ]
 
-    elements.append(PageBreak())
 
-    # =========================================================================
-    # SECTION 7: RESULTS
-    # =========================================================================
-    elements.append(Paragraph("7. Results", heading1_style))
+# =========================================================================
+# TABLE OF CONTENTS
+# =========================================================================
+@functools.lru_cache(maxsize=1)
+def _toc_paras():
+    """Parse the contents entries once, by section number."""
+    from reportlab.platypus import Paragraph
 
-    elements.append(Paragraph(
-        "The following table presents the final mortality statistics for each US territory "
-        "based on the 2023 CDC Multiple Cause of Death Public Use File:",
-        body_style
-    ))
+    styles = _build_styles()
+    return {number: Paragraph(item, styles['body']) for number, item in _TOC_ENTRIES.items()}
+
+
+def _contents_page(sections):
+    """Table of contents page, listing only the numbered `sections`."""
+    from reportlab.platypus import Paragraph, PageBreak
+
+    styles = _build_styles()
+    toc_paras = _toc_paras()
+    return [
+        Paragraph("Table of Contents", styles['heading1']),
+        *(toc_paras[number] for number in sections),
+        PageBreak(),
+    ]
+
+
+# =========================================================================
+# SECTION 1: OVERVIEW
+# =========================================================================
+def _overview_section():
+    """Section 1: overview and request."""
+    from reportlab.platypus import Paragraph, Spacer
+
+    styles = _build_styles()
+    elements = [
+        Paragraph("1. Overview and Request", styles['heading1']),
+        Paragraph(
+            "This document describes the methodology used to calculate mortality statistics "
+            "for US territories using CDC Multiple Cause of Death Public Use Files. The analysis "
+            "was performed to create fact sheets for the following US territories:",
+            styles['body']
+        ),
+        *(Paragraph(f"• {t}", styles['list_item']) for t in (
+            "Guam (GU)",
+            "Puerto Rico (PR)",
+            "Virgin Islands (VI)",
+            "American Samoa (AS)",
+            "Northern Mariana Islands (MP)",
+        )),
+        Spacer(1, 10),
+        Paragraph(
+            "The requested statistics included: (1) Drug-related deaths, (2) Overdose-related deaths, "
+            "and (3) Suicide deaths for the year 2023.",
+            styles['body']
+        ),
+    ]
+
+    return elements
+
+
+# =========================================================================
+# SECTION 2: DATA SOURCE
+# =========================================================================
+def _data_source_section():
+    """Section 2: data source and file characteristics."""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import PageBreak, Paragraph, Preformatted, Table
+
+    styles = _build_styles()
+    table_styles = _table_styles()
+    elements = [
+        Paragraph("2. Data Source", styles['heading1']),
+        Paragraph(
+            "The data was obtained from the CDC National Center for Health Statistics (NCHS) "
+            "Multiple Cause of Death Public Use Files. These files contain mortality data "
+            "collected from death certificates filed in the United States.",
+            styles['body']
+        ),
+        Paragraph("2.1 Download Location", styles['heading2']),
+        Paragraph(
+            "The data was downloaded from the CDC FTP server:",
+            styles['body']
+        ),
+        Preformatted(
+            "URL:  https://ftp.cdc.gov/pub/Health_Statistics/NCHS/Datasets/DVS/mortality/\n"
+            "File: mort2023ps.zip\n"
+            "Unzipped file: VS23MORT.DPSMCPUB_r20241030",
+            styles['code']
+        ),
+        Paragraph(
+            "<b>Note:</b> The CDC provides separate files for US states and US territories. "
+            "The file used (mort2023ps.zip) contains data specifically for US possessions/territories.",
+            styles['note']
+        ),
+        Paragraph("2.2 File Characteristics", styles['heading2']),
+    ]
+    file_chars = [
+        ["Characteristic", "Value"],
+        ["Data Year", "2023"],
+        ["File Format", "Fixed-width ASCII text"],
+        ["Record Length", "818 characters per line"],
+        ["Total Records (Territories)", "36,476"],
+        ["Encoding", "Latin-1"],
+    ]
+    file_table = Table(file_chars, colWidths=[2.5*inch, 4.3*inch])
+    file_table.setStyle(table_styles['green_header'])
+    elements.extend([
+        file_table,
+        Paragraph("2.3 Documentation Reference", styles['heading2']),
+        Paragraph(
+            "The file layout documentation was obtained from:",
+            styles['body']
+        ),
+        Preformatted(
+            "URL: https://ftp.cdc.gov/pub/Health_Statistics/NCHS/Dataset_Documentation/\n"
+            "     DVS/mortality/2022-Mortality-Public-Use-File-Documentation.pdf\n\n"
+            "Note: The 2022 documentation applies to the 2023 file format as well.",
+            styles['code']
+        ),
+        PageBreak(),
+    ])
+
+    return elements
+
+
+# =========================================================================
+# SECTION 3: FILE FORMAT
+# =========================================================================
+def _file_format_section():
+    """Section 3: file format and key field positions."""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import LongTable, PageBreak, Paragraph, Preformatted, Spacer
+
+    styles = _build_styles()
+    table_styles = _table_styles()
+    elements = [
+        Paragraph("3. File Format and Layout", styles['heading1']),
+        Paragraph(
+            "The CDC mortality file uses a fixed-width format where each field occupies "
+            "specific character positions. The following table shows the key fields used "
+            "in this analysis:",
+            styles['body']
+        ),
+        Paragraph("3.1 Key Field Positions", styles['heading2']),
+    ]
+
+    # Every cell here fits its column on one line, so plain strings are enough
+    field_data = [
+        ["Field Name", "Position", "Length", "Description"],
+        ["State of Occurrence", "21-22", "2", "FIPS state/territory code where death occurred"],
+        ["State of Residence", "29-30", "2", "FIPS state/territory code of decedent's residence"],
+        ["Data Year", "102-105", "4", "Year of death (e.g., 2023)"],
+        ["Manner of Death", "107", "1", "Code indicating manner of death (1-7)"],
+        ["ICD-10 Underlying Cause", "146-149", "4", "ICD-10 code for underlying cause of death"],
+    ]
+
+    field_table = LongTable(field_data, colWidths=[1.6*inch, 0.8*inch, 0.6*inch, 3.8*inch])
+    field_table.setStyle(table_styles['field'])
+    elements.extend([
+        field_table,
+        Spacer(1, 10),
+        Paragraph(
+            "<b>Important:</b> Position numbers in the CDC documentation are 1-indexed. "
+            "When using Python (0-indexed), subtract 1 from the starting position. "
+            "For example, 'Position 21-22' in the documentation corresponds to "
+            "<font face='Courier'>line[20:22]</font> in Python.",
+            styles['note']
+        ),
+        Paragraph("3.2 Sample Raw Data", styles['heading2']),
+        Paragraph(
+            "Below is a sample record from the data file with key fields highlighted:",
+            styles['body']
+        ),
+        Preformatted(_SAMPLE_RECORD_CODE, styles['code']),
+        PageBreak(),
+    ])
+
+    return elements
+
+
+# =========================================================================
+# SECTION 4: FIELD DEFINITIONS
+# =========================================================================
+def _field_definitions_section():
+    """Section 4: territory and manner-of-death codes."""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import LongTable, PageBreak, Paragraph, Spacer
+
+    styles = _build_styles()
+    table_styles = _table_styles()
+    elements = [
+        Paragraph("4. Field Definitions", styles['heading1']),
+        Paragraph("4.1 Territory Codes", styles['heading2']),
+        Paragraph(
+            "US territories are identified using 2-character FIPS codes. Statistics were "
+            "calculated based on <b>State of Occurrence</b> (position 21-22), meaning deaths "
+            "are attributed to the territory where the death occurred. This matches the CDC VSRR "
+            "(Vital Statistics Rapid Release) methodology.",
+            styles['body']
+        ),
+        Spacer(1, 6),
+        Paragraph(
+            "<b>Foreign residents are excluded</b> (resident_status = 4 at position 20) to match "
+            "CDC WONDER methodology. Foreign residents are deaths occurring in the US where the "
+            "decedent resided outside the US.",
+            styles['body']
+        ),
+    ]
+
+    territory_codes = [
+        ["Code", "Territory", "Records in 2023 File"],
+        ["GU", "Guam", "1,183"],
+        ["PR", "Puerto Rico", "33,958"],
+        ["VI", "Virgin Islands", "750"],
+        ["AS", "American Samoa", "0 (no data)"],
+        ["MP", "Northern Mariana Islands", "232"],
+    ]
+
+    terr_table = LongTable(territory_codes, colWidths=[1*inch, 3*inch, 2.8*inch])
+    terr_table.setStyle(table_styles['green_header'])
+    elements.extend([
+        terr_table,
+        Paragraph("4.2 Manner of Death Codes", styles['heading2']),
+        Paragraph(
+            "The Manner of Death field (position 107) indicates how the death occurred:",
+            styles['body']
+        ),
+    ])
+
+    manner_codes = [
+        ["Code", "Description"],
+        ["1", "Accident"],
+        ["2", "Suicide"],
+        ["3", "Homicide"],
+        ["4", "Pending investigation"],
+        ["5", "Could not determine"],
+        ["6", "Self-Inflicted"],
+        ["7", "Natural"],
+        ["Blank", "Not specified"],
+    ]
 
-    elements.append(Paragraph("7.1 Summary Statistics", heading2_style))
+    manner_table = LongTable(manner_codes, colWidths=[1*inch, 5.8*inch])
+    manner_table.setStyle(table_styles['manner'])
+    elements.extend([
+        manner_table,
+        PageBreak(),
+    ])
+
+    return elements
+
+
+# =========================================================================
+# SECTION 5: ICD-10 CLASSIFICATIONS
+# =========================================================================
+def _icd10_section():
+    """Section 5: ICD-10 code classifications."""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import PageBreak, Paragraph, Table
+
+    styles = _build_styles()
+    table_styles = _table_styles()
+    elements = [
+        Paragraph("5. ICD-10 Code Classifications", styles['heading1']),
+        Paragraph(
+            "The International Classification of Diseases, 10th Revision (ICD-10) codes "
+            "are used to classify the underlying cause of death. The following sections "
+            "describe how each statistic was defined using ICD-10 codes.",
+            styles['body']
+        ),
+        Paragraph("5.1 Drug Overdose Deaths", styles['heading2']),
+        Paragraph(
+            "Drug overdose deaths are identified using ICD-10 codes for poisoning by drugs, "
+            "medicaments, and biological substances. The following code ranges were used:",
+            styles['body']
+        ),
+    ]
+
+    overdose_codes = [
+        ["ICD-10 Range", "Description", "Intent"],
+        ["X40-X44",
+         Paragraph("Accidental poisoning by drugs, medicaments and biological substances", styles['cell']),
+         "Accidental"],
+        ["X60-X64",
+         Paragraph("Intentional self-poisoning by drugs, medicaments and biological substances", styles['cell']),
+         "Intentional (suicide)"],
+        ["Y10-Y14",
+         Paragraph("Poisoning by drugs, medicaments and biological substances, undetermined intent", styles['cell']),
+         "Undetermined"],
+    ]
+
+    od_table = Table(overdose_codes, colWidths=[1.1*inch, 4.2*inch, 1.5*inch])
+    od_table.setStyle(table_styles['orange_header'])
+    elements.extend([
+        od_table,
+        Paragraph("5.2 Drug-Related Deaths (Broader Definition)", styles['heading2']),
+        Paragraph(
+            "Drug-related deaths include overdose deaths plus additional drug-induced causes. "
+            "This broader category captures deaths where drugs played a significant role:",
+            styles['body']
+        ),
+    ])
+
+    drug_related_codes = [
+        ["ICD-10 Range", "Description"],
+        ["X40-X44, X60-X64, Y10-Y14",
+         "Drug overdose (as defined above)"],
+        ["F11-F16, F18-F19",
+         Paragraph("Mental and behavioral disorders due to psychoactive substance use (excluding F10 alcohol and F17 tobacco)", styles['cell'])],
+        ["T36-T50",
+         Paragraph("Poisoning by drugs, medicaments and biological substances (therapeutic/accidental)", styles['cell'])],
+    ]
+
+    dr_table = Table(drug_related_codes, colWidths=[2.2*inch, 4.6*inch])
+    dr_table.setStyle(table_styles['orange_header'])
+    elements.extend([
+        dr_table,
+        Paragraph("5.3 Suicide Deaths", styles['heading2']),
+        Paragraph(
+            "Suicide deaths are identified using two methods:",
+            styles['body']
+        ),
+        Paragraph(
+            "<b>Method 1:</b> Manner of Death code = 2 (Suicide)<br/>"
+            "<b>Method 2:</b> ICD-10 codes X60-X84 (Intentional self-harm) or U03 (Terrorism involving suicide)",
+            styles['body']
+        ),
+        Paragraph(
+            "A death is counted as suicide if either condition is met.",
+            styles['body']
+        ),
+    ])
+
+    suicide_codes = [
+        ["ICD-10 Range", "Description"],
+        ["X60-X84",
+         Paragraph("Intentional self-harm (includes all methods: poisoning, hanging, firearm, etc.)", styles['cell'])],
+        ["U03", "Terrorism involving suicide"],
+    ]
+
+    sui_table = Table(suicide_codes, colWidths=[1.5*inch, 5.3*inch])
+    sui_table.setStyle(table_styles['blue_header'])
+    elements.extend([
+        sui_table,
+        PageBreak(),
+    ])
+
+    return elements
+
+
+# =========================================================================
+# SECTION 6: DATA PROCESSING CODE
+# =========================================================================
+def _processing_code_section():
+    """Section 6: data processing code listings."""
+    from reportlab.platypus import PageBreak, Paragraph, Preformatted
+
+    styles = _build_styles()
+    elements = [
+        Paragraph("6. Data Processing Code", styles['heading1']),
+        Paragraph(
+            "The following Python code was used to process the CDC mortality data file. "
+            "The code reads the fixed-width file, extracts relevant fields, and calculates "
+            "statistics for each territory.",
+            styles['body']
+        ),
+        Paragraph("6.1 Reading the Data File", styles['heading2']),
+        Preformatted(_READ_FILE_CODE, styles['code']),
+        Paragraph("6.2 Identifying Drug Overdose Deaths", styles['heading2']),
+        Preformatted(_IS_DRUG_OVERDOSE_CODE, styles['code']),
+        Paragraph("6.3 Identifying Drug-Related Deaths", styles['heading2']),
+        Preformatted(_IS_DRUG_RELATED_CODE, styles['code']),
+        PageBreak(),
+        Paragraph("6.4 Identifying Suicide Deaths", styles['heading2']),
+        Preformatted(_IS_SUICIDE_CODE, styles['code']),
+        Paragraph("6.5 Main Processing Loop", styles['heading2']),
+        Preformatted(_MAIN_LOOP_CODE, styles['code']),
+        PageBreak(),
+    ]
+
+    return elements
+
+
+# =========================================================================
+# SECTION 7: RESULTS
+# =========================================================================
+def _results_section():
+    """Section 7: results and validation."""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import LongTable, PageBreak, Paragraph, Spacer, Table
+
+    styles = _build_styles()
+    table_styles = _table_styles()
+    elements = [
+        Paragraph("7. Results", styles['heading1']),
+        Paragraph(
+            "The following table presents the final mortality statistics for each US territory "
+            "based on the 2023 CDC Multiple Cause of Death Public Use File:",
+            styles['body']
+        ),
+        Paragraph("7.1 Summary Statistics", styles['heading2']),
+    ]
 
     results_data = [
-        [Paragraph("<b>Territory</b>", header_cell_style),
-         Paragraph("<b>Total Deaths</b>", header_cell_style),
-         Paragraph("<b>Suicide Deaths</b>", header_cell_style),
-         Paragraph("<b>Overdose Deaths</b>", header_cell_style),
-         Paragraph("<b>Drug-Related Deaths</b>", header_cell_style)],
+        ["Territory", "Total Deaths", "Suicide Deaths", "Overdose Deaths", "Drug-Related Deaths"],
         ["Puerto Rico", "34,290", "236", "786", "2,412"],
         ["Guam", "1,193", "31", "34", "229"],
         ["Virgin Islands", "758", "10", "5", "23"],
         ["American Samoa", "N/A*", "N/A", "N/A", "N/A"],
-        [Paragraph("Northern Mariana Islands", cell_style), "235", "4", "0", "25"],
+        ["Northern Mariana Islands", "235", "4", "0", "25"],
     ]
 
-    results_table = Table(results_data, colWidths=[1.8*inch, 1.1*inch, 1.1*inch, 1.2*inch, 1.6*inch])
-    results_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E8B57')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('ALIGN', (0, 0), (-1, 0), 'LEFT'),  # Header row all left
-        ('ALIGN', (0, 1), (0, -1), 'LEFT'),   # Territory column left
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'), # All cells left-aligned
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    elements.append(results_table)
-
-    elements.append(Spacer(1, 10))
-    elements.append(Paragraph(
-        "*American Samoa did not report mortality data for 2023 (see CDC NVSR Vol 74, No 8: "
-        "https://www.cdc.gov/nchs/data/nvsr/nvsr74/nvsr-74-08.pdf).",
-        note_style
-    ))
-
-    elements.append(Paragraph("7.2 Validation: Public-Use Files vs CDC WONDER", heading2_style))
-    elements.append(Paragraph(
-        "To validate our methodology, we compared <b>national US overdose death counts</b> from both "
-        "data sources using identical ICD-10 codes (X40-X44, X60-X64, X85, Y10-Y14) as underlying or "
-        "contributing cause.",
-        body_style
-    ))
-    elements.append(Spacer(1, 8))
-
-    elements.append(Paragraph(
-        "<b>CDC WONDER excludes foreign residents</b> - deaths that occurred in the US where the decedent "
-        "resided outside the US (resident_status = 4 in the public-use files). When we exclude foreign "
-        "residents from the public-use files, the counts match CDC WONDER exactly:",
-        body_style
-    ))
-    elements.append(Spacer(1, 8))
+    results_table = LongTable(results_data, colWidths=[1.8*inch, 1.1*inch, 1.1*inch, 1.2*inch, 1.6*inch])
+    results_table.setStyle(table_styles['results'])
+    elements.extend([
+        results_table,
+        Spacer(1, 10),
+        Paragraph(
+            "*American Samoa did not report mortality data for 2023 (see CDC NVSR Vol 74, No 8: "
+            "https://www.cdc.gov/nchs/data/nvsr/nvsr74/nvsr-74-08.pdf).",
+            styles['note']
+        ),
+        Paragraph("7.2 Validation: Public-Use Files vs CDC WONDER", styles['heading2']),
+        Paragraph(
+            "To validate our methodology, we compared <b>national US overdose death counts</b> from both "
+            "data sources using identical ICD-10 codes (X40-X44, X60-X64, X85, Y10-Y14) as underlying or "
+            "contributing cause.",
+            styles['body']
+        ),
+        Spacer(1, 8),
+        Paragraph(
+            "<b>CDC WONDER excludes foreign residents</b> - deaths that occurred in the US where the decedent "
+            "resided outside the US (resident_status = 4 in the public-use files). When we exclude foreign "
+            "residents from the public-use files, the counts match CDC WONDER exactly:",
+            styles['body']
+        ),
+        Spacer(1, 8),
+    ])
 
     validation_data = [
-        [Paragraph("<b>Metric</b>", header_cell_style),
-         Paragraph("<b>CDC WONDER</b>", header_cell_style),
-         Paragraph("<b>Public-Use (ALL)</b>", header_cell_style),
-         Paragraph("<b>Public-Use (excl. foreign)</b>", header_cell_style)],
+        ["Metric", "CDC WONDER", "Public-Use (ALL)", "Public-Use (excl. foreign)"],
         ["2023 Overdose Deaths", "112,106", "114,121 (+1.8%)", "112,106 (exact match)"],
         ["2023 Total Deaths", "3,090,964", "3,101,016 (+0.3%)", "3,090,964 (exact match)"],
     ]
 
     validation_table = Table(validation_data, colWidths=[1.8*inch, 1.2*inch, 1.5*inch, 2.0*inch])
-    validation_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E8B57')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    elements.append(validation_table)
-    elements.append(Spacer(1, 8))
+    validation_table.setStyle(table_styles['validation'])
+    elements.extend([
+        validation_table,
+        Spacer(1, 8),
+        Paragraph(
+            "In 2023, there were 10,052 foreign resident deaths (0.32% of total) and 2,015 foreign resident "
+            "overdose deaths (1.77% of overdoses). This analysis excludes foreign residents to match CDC WONDER methodology.",
+            styles['body']
+        ),
+        PageBreak(),
+    ])
+
+    return elements
+
+
+# =========================================================================
+# SECTION 8: APPENDIX
+# =========================================================================
+def _appendix_section():
+    """Section 8: replication appendix."""
+    from reportlab.platypus import Paragraph, Preformatted, Spacer
+
+    styles = _build_styles()
+    elements = [
+        Paragraph("8. Appendix: Replication", styles['heading1']),
+        Paragraph(
+            "The complete Python scripts used for data processing and fact sheet generation "
+            "are included with this document:",
+            styles['body']
+        ),
+        Paragraph("• <b>process_mortality_data.py</b> - Main data processing script", styles['body']),
+        Paragraph("• <b>create_report.py</b> - PDF summary report generator", styles['body']),
+        Paragraph("• <b>create_methodology_document.py</b> - This methodology document generator", styles['body']),
+        Paragraph("8.1 Data Files", styles['heading2']),
+        Preformatted(
+            "Data Files:\n"
+            "  VS23MORT.DPSMCPUB_r20241030     (Raw mortality data from CDC)\n"
+            "  2023-Mortality-Public-Use-File-Documentation.pdf (File layout documentation)\n\n"
+            "Output:\n"
+            "  territory_mortality_summary_2023.csv\n"
+            "  US_Territory_Mortality_Statistics_2023.pdf\n"
+            "  Methodology_US_Territory_Mortality_Statistics.pdf",
+            styles['code']
+        ),
+        Paragraph("8.2 Replication Steps", styles['heading2']),
+        Paragraph(
+            "To verify these results, download the CDC mortality data file and run the processing script:",
+            styles['body']
+        ),
+        Preformatted(
+            "# Download data from CDC\n"
+            "wget https://ftp.cdc.gov/pub/Health_Statistics/NCHS/Datasets/DVS/mortality/mort2023ps.zip\n"
+            "unzip mort2023ps.zip\n\n"
+            "# Run processing script\n"
+            "python3 process_mortality_data.py",
+            styles['code']
+        ),
+        Spacer(1, 30),
+    ]
 
-    elements.append(Paragraph(
-        "In 2023, there were 10,052 foreign resident deaths (0.32% of total) and 2,015 foreign resident "
-        "overdose deaths (1.77% of overdoses). This analysis excludes foreign residents to match CDC WONDER methodology.",
-        body_style
-    ))
+    return elements
 
-    elements.append(PageBreak())
 
-    # =========================================================================
-    # SECTION 8: APPENDIX
-    # =========================================================================
-    elements.append(Paragraph("8. Appendix: Replication", heading1_style))
+# Section builders, keyed by their numbers in the table of contents
+SECTIONS = {
+    1: _overview_section,
+    2: _data_source_section,
+    3: _file_format_section,
+    4: _field_definitions_section,
+    5: _icd10_section,
+    6: _processing_code_section,
+    7: _results_section,
+    8: _appendix_section,
+}
 
-    elements.append(Paragraph(
-        "The complete Python scripts used for data processing and fact sheet generation "
-        "are included with this document:",
-        body_style
-    ))
 
-    elements.append(Paragraph("• <b>process_mortality_data.py</b> - Main data processing script", body_style))
-    elements.append(Paragraph("• <b>create_report.py</b> - PDF summary report generator", body_style))
-    elements.append(Paragraph("• <b>create_methodology_document.py</b> - This methodology document generator", body_style))
-
-    elements.append(Paragraph("8.1 Data Files", heading2_style))
-    elements.append(Preformatted(
-        "Data Files:\n"
-        "  VS23MORT.DPSMCPUB_r20241030     (Raw mortality data from CDC)\n"
-        "  2023-Mortality-Public-Use-File-Documentation.pdf (File layout documentation)\n\n"
-        "Output:\n"
-        "  territory_mortality_summary_2023.csv\n"
-        "  US_Territory_Mortality_Statistics_2023.pdf\n"
-        "  Methodology_US_Territory_Mortality_Statistics.pdf",
-        code_style
-    ))
+@functools.lru_cache(maxsize=None)
+def _static_elements(builder):
+    """Run a builder for a date-independent part of the document, once."""
+    return tuple(builder())
 
-    elements.append(Paragraph("8.2 Replication Steps", heading2_style))
-    elements.append(Paragraph(
-        "To verify these results, download the CDC mortality data file and run the processing script:",
-        body_style
-    ))
-    elements.append(Preformatted(
-        "# Download data from CDC\n"
-        "wget https://ftp.cdc.gov/pub/Health_Statistics/NCHS/Datasets/DVS/mortality/mort2023ps.zip\n"
-        "unzip mort2023ps.zip\n\n"
-        "# Run processing script\n"
-        "python3 process_mortality_data.py",
-        code_style
-    ))
 
-    elements.append(Spacer(1, 30))
+@functools.lru_cache(maxsize=1)
+def _render_pdf(prepared, sections=tuple(SECTIONS)):
+    """Render the document dated `prepared` and return the PDF bytes.
+
+    Only the numbered `sections` are included after the contents page. The
+    content is fixed apart from the date, so repeat calls on the same day
+    return the cached bytes without rebuilding.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate
+
+    styles = _build_styles()
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        topMargin=0.75*inch,
+        bottomMargin=0.75*inch,
+        leftMargin=0.6*inch,
+        rightMargin=0.6*inch,
+        pageCompression=1,
+        invariant=1,
+    )
+
+    # Platypus marks the flowables it lays out (_postponed, keepWithNext), so
+    # each build gets shallow copies of the shared ones
+    elements = [
+        *map(copy.copy, _static_elements(_title_page)),
+        Paragraph(f"Prepared: {prepared}", styles['date']),
+        PageBreak(),
+        *map(copy.copy, _contents_page(sections)),
+    ]
+    for number in sections:
+        elements.extend(map(copy.copy, _static_elements(SECTIONS[number])))
 
     # Footer
     elements.append(Paragraph(
-        f"<b>Date:</b> {datetime.now().strftime('%B %d, %Y')}<br/>"
+        f"<b>Date:</b> {prepared}<br/>"
         "<b>Data Source:</b> CDC NCHS Multiple Cause of Death Public Use Files, 2023",
-        ParagraphStyle('Footer', parent=body_style, alignment=TA_CENTER, fontSize=9)
+        styles['footer']
     ))
 
     # Build the document
     doc.build(elements)
-    print(f"Methodology document created: {OUTPUT_FILE}")
+    return buffer.getvalue()
+
+
+def _output_file(sections):
+    """Path for a document with `sections`: OUTPUT_FILE only when all are included."""
+    if sections == tuple(SECTIONS):
+        return OUTPUT_FILE
+    suffix = '-'.join(map(str, sections))
+    return OUTPUT_FILE.with_name(f"{OUTPUT_FILE.stem}_sections_{suffix}{OUTPUT_FILE.suffix}")
+
+
+def create_methodology_document(sections=None):
+    """Create the methodology PDF document.
+
+    `sections` limits the document to those section numbers; by default
+    every section is included. A subset is written next to the full
+    document under a section-suffixed name, so it never replaces it.
+    """
+    sections = tuple(SECTIONS) if sections is None else tuple(sections)
+    prepared = date.today().strftime('%B %d, %Y')
+    output_file = _output_file(sections)
+
+    # The content is fixed apart from the date and section selection
+    key = output_cache.input_key(__file__, prepared, sections)
+    if output_cache.is_current(output_file, key):
+        print(f"Methodology document up to date: {output_file}")
+        return
+    pdf_bytes = _render_pdf(prepared, sections)
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_bytes(pdf_bytes)
+    output_cache.record(output_file, key)
+    print(f"Methodology document created: {output_file}")
+
+def _parse_sections(value):
+    """Parse a comma-separated list of section numbers for --sections."""
+    try:
+        numbers = {int(n) for n in value.split(',')}
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid section list: {value!r}")
+    unknown = numbers - SECTIONS.keys()
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown section(s): {', '.join(map(str, sorted(unknown)))} "
+            f"(choose from {min(SECTIONS)}-{max(SECTIONS)})"
+        )
+    return sorted(numbers)
+
 
 if __name__ == "__main__":
-    create_methodology_document()
+    parser = argparse.ArgumentParser(description="Create the methodology PDF document.")
+    parser.add_argument(
+        '--sections', type=_parse_sections,
+        help="comma-separated section numbers to include, e.g. 1,2,7 (default: all)",
+    )
+    args = parser.parse_args()
+    create_methodology_document(args.sections)
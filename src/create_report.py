@@ -3,12 +3,12 @@
 Create PDF report for US Territory Mortality Statistics 2023
 """
 
+import copy
+import functools
+import io
 import os
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+import output_cache
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
@@ -29,137 +29,183 @@ VALIDATION_DATA = [
     ("2023 Total Deaths", "3,090,964", "3,101,016 (+0.3%)", "3,090,964 (exact match)"),
 ]
 
+# Header rows for the results and validation tables
+_RESULTS_HEADER = ("Territory", "Total Deaths", "Drug-Related", "Overdose", "Suicide")
+_VALIDATION_HEADER = ("Metric", "CDC WONDER", "Public-Use (ALL)", "Public-Use (excl. foreign)")
 
-def create_report():
-    """Generate PDF report."""
-    pdf_path = os.path.join(OUTPUT_DIR, "US_Territory_Mortality_Statistics_2023.pdf")
-    doc = SimpleDocTemplate(pdf_path, pagesize=letter,
-                           leftMargin=0.75*inch, rightMargin=0.75*inch,
-                           topMargin=0.75*inch, bottomMargin=0.75*inch)
+# Complete table data (header first) for the published report
+_RESULTS_TABLE_DATA = [_RESULTS_HEADER, *RESULTS]
+_VALIDATION_TABLE_DATA = [_VALIDATION_HEADER, *VALIDATION_DATA]
 
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=16, spaceAfter=12)
-    heading_style = ParagraphStyle('Heading', parent=styles['Heading2'], fontSize=12, spaceAfter=8, spaceBefore=16)
-    body_style = ParagraphStyle('Body', parent=styles['Normal'], fontSize=10, spaceAfter=6)
-    footnote_style = ParagraphStyle('Footnote', parent=styles['Normal'], fontSize=8, textColor=colors.gray)
-
-    elements = []
-
-    # Title
-    elements.append(Paragraph("US Territory Mortality Statistics 2023", title_style))
-    elements.append(Spacer(1, 12))
-
-    # Introduction
-    elements.append(Paragraph(
-        "Mortality statistics for US territories extracted from CDC Multiple Cause of Death "
-        "Public Use Files. Statistics include deaths where the relevant ICD-10 code appears "
-        "as either the underlying cause or any contributing cause.",
-        body_style
-    ))
-    elements.append(Spacer(1, 12))
-
-    # Results table
-    elements.append(Paragraph("Results Summary", heading_style))
-
-    table_data = [["Territory", "Total Deaths", "Drug-Related", "Overdose", "Suicide"]]
-    table_data.extend(RESULTS)
-
-    table = Table(table_data, colWidths=[2*inch, 1.1*inch, 1.1*inch, 0.9*inch, 0.8*inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
+# ReportLab is imported on the first build rather than at module load, so
+# create_report() finds an up-to-date PDF without ever loading it. The
+# styles and static flowables below are built once, on that first build.
+
+
+@functools.lru_cache(maxsize=1)
+def _table_style():
+    """Shared by the results and validation tables: blue header row, striped body."""
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+
+    blue = colors.HexColor('#4472C4')
+    blue_light = colors.HexColor('#D9E2F3')
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), blue),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
         ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
         ('FONTSIZE', (0, 0), (-1, -1), 9),
         ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
         ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#D9E2F3')]),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, blue_light]),
         ('TOPPADDING', (0, 0), (-1, -1), 4),
         ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(table)
-    elements.append(Spacer(1, 6))
-    elements.append(Paragraph(
-        "*American Samoa did not report mortality data for 2023 (CDC NVSR Vol 74, No 8).",
-        footnote_style
-    ))
-    elements.append(Spacer(1, 12))
-
-    # Methodology
-    elements.append(Paragraph("Methodology", heading_style))
-    elements.append(Paragraph(
-        "<b>Multiple Cause of Death Approach:</b> Deaths are counted if the relevant ICD-10 code "
-        "appears as either the underlying cause OR any of up to 20 contributing causes. "
-        "Statistics are based on State of Occurrence (where death occurred).",
-        body_style
-    ))
-    elements.append(Spacer(1, 8))
-
-    elements.append(Paragraph("<b>Overdose Deaths:</b> X40-X44, X60-X64, X85, Y10-Y14", body_style))
-    elements.append(Paragraph(
-        "<b>Drug-Related Deaths:</b> Based on CDC NVSR 74-04 definitions - includes overdose codes "
-        "plus D52.1, D59.0, D59.2, D61.1, D64.2, E06.4, E23.1, E24.2, E27.3, E66.1, "
-        "F11-F19 (specific subcategories), G/I/J/K/L/M/R codes (specific only). "
-        "Does NOT include T36-T50.",
-        body_style
-    ))
-    elements.append(Paragraph(
-        "<b>Suicide Deaths:</b> Manner of Death = 2 (Suicide) OR ICD-10 codes X60-X84, U03, Y87.0",
-        body_style
-    ))
-    elements.append(Spacer(1, 12))
-
-    # Validation section
-    elements.append(Paragraph("Validation: Public-Use Files vs CDC WONDER", heading_style))
-    elements.append(Paragraph(
-        "<b>CDC WONDER excludes foreign residents</b> - deaths occurring in the US where the decedent "
-        "resided outside the US. When we exclude foreign residents (resident_status = 4) from the "
-        "public-use files, the counts match CDC WONDER exactly:",
-        body_style
-    ))
-    elements.append(Spacer(1, 8))
-
-    validation_table_data = [["Metric", "CDC WONDER", "Public-Use (ALL)", "Public-Use (excl. foreign)"]]
-    validation_table_data.extend(VALIDATION_DATA)
+    ])
+
+
+@functools.lru_cache(maxsize=1)
+def _build_styles():
+    """Build the paragraph styles used by the report."""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle('Title', parent=styles['Heading1'], fontSize=16, spaceAfter=12),
+        'heading': ParagraphStyle('Heading', parent=styles['Heading2'], fontSize=12, spaceAfter=8, spaceBefore=16),
+        'body': ParagraphStyle('Body', parent=styles['Normal'], fontSize=10, spaceAfter=6),
+        'footnote': ParagraphStyle('Footnote', parent=styles['Normal'], fontSize=8, textColor=colors.gray),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _static_flowables():
+    """Build the (intro, methodology, footer) flowables around the two tables.
+
+    doc.build() annotates the flowables it lays out, so callers copy these
+    per build instead of passing them in directly.
+    """
+    from reportlab.platypus import Paragraph, Spacer
+
+    styles = _build_styles()
+    intro = (
+        Paragraph("US Territory Mortality Statistics 2023", styles['title']),
+        Spacer(1, 12),
+        Paragraph(
+            "Mortality statistics for US territories extracted from CDC Multiple Cause of Death "
+            "Public Use Files. Statistics include deaths where the relevant ICD-10 code appears "
+            "as either the underlying cause or any contributing cause.",
+            styles['body']
+        ),
+        Spacer(1, 12),
+        Paragraph("Results Summary", styles['heading']),
+    )
+
+    methodology = (
+        Spacer(1, 6),
+        Paragraph(
+            "*American Samoa did not report mortality data for 2023 (CDC NVSR Vol 74, No 8).",
+            styles['footnote']
+        ),
+        Spacer(1, 12),
+        Paragraph("Methodology", styles['heading']),
+        Paragraph(
+            "<b>Multiple Cause of Death Approach:</b> Deaths are counted if the relevant ICD-10 code "
+            "appears as either the underlying cause OR any of up to 20 contributing causes. "
+            "Statistics are based on State of Occurrence (where death occurred).",
+            styles['body']
+        ),
+        Spacer(1, 8),
+        Paragraph("<b>Overdose Deaths:</b> X40-X44, X60-X64, X85, Y10-Y14", styles['body']),
+        Paragraph(
+            "<b>Drug-Related Deaths:</b> Based on CDC NVSR 74-04 definitions - includes overdose codes "
+            "plus D52.1, D59.0, D59.2, D61.1, D64.2, E06.4, E23.1, E24.2, E27.3, E66.1, "
+            "F11-F19 (specific subcategories), G/I/J/K/L/M/R codes (specific only). "
+            "Does NOT include T36-T50.",
+            styles['body']
+        ),
+        Paragraph(
+            "<b>Suicide Deaths:</b> Manner of Death = 2 (Suicide) OR ICD-10 codes X60-X84, U03, Y87.0",
+            styles['body']
+        ),
+        Spacer(1, 12),
+        Paragraph("Validation: Public-Use Files vs CDC WONDER", styles['heading']),
+        Paragraph(
+            "<b>CDC WONDER excludes foreign residents</b> - deaths occurring in the US where the decedent "
+            "resided outside the US. When we exclude foreign residents (resident_status = 4) from the "
+            "public-use files, the counts match CDC WONDER exactly:",
+            styles['body']
+        ),
+        Spacer(1, 8),
+    )
+
+    footer = (
+        Spacer(1, 8),
+        Paragraph(
+            "This analysis excludes foreign residents to match CDC WONDER methodology. In 2023, there were "
+            "10,052 foreign resident deaths (0.32% of total) and 2,015 foreign resident overdose deaths (1.77% of overdoses).",
+            styles['body']
+        ),
+        Spacer(1, 12),
+        Paragraph("Data Source", styles['heading']),
+        Paragraph(
+            "<b>CDC NCHS Multiple Cause of Death Public Use Files</b><br/>"
+            "Download: https://ftp.cdc.gov/pub/Health_Statistics/NCHS/Datasets/DVS/mortality/<br/>"
+            "File: mort2023ps.zip (US Territories)",
+            styles['body']
+        ),
+        Spacer(1, 8),
+        Paragraph(
+            "References: CDC NVSR 74-04 (drug-induced death codes), CDC NVSR 74-08 (2023 mortality summary)",
+            styles['footnote']
+        ),
+    )
+    return intro, methodology, footer
+
+
+def build_mortality_pdf(results_table_data, validation_table_data, pdf_path):
+    """Build the summary PDF at pdf_path from complete table data (header row first)."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                           leftMargin=0.75*inch, rightMargin=0.75*inch,
+                           topMargin=0.75*inch, bottomMargin=0.75*inch,
+                           pageCompression=1, invariant=1)
+
+    table = Table(results_table_data, colWidths=[2*inch, 1.1*inch, 1.1*inch, 0.9*inch, 0.8*inch])
+    table.setStyle(_table_style())
 
     validation_table = Table(validation_table_data, colWidths=[1.8*inch, 1.2*inch, 1.5*inch, 2.0*inch])
-    validation_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#D9E2F3')]),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(validation_table)
-    elements.append(Spacer(1, 8))
-    elements.append(Paragraph(
-        "This analysis excludes foreign residents to match CDC WONDER methodology. In 2023, there were "
-        "10,052 foreign resident deaths (0.32% of total) and 2,015 foreign resident overdose deaths (1.77% of overdoses).",
-        body_style
-    ))
-    elements.append(Spacer(1, 12))
-
-    # Data source
-    elements.append(Paragraph("Data Source", heading_style))
-    elements.append(Paragraph(
-        "<b>CDC NCHS Multiple Cause of Death Public Use Files</b><br/>"
-        "Download: https://ftp.cdc.gov/pub/Health_Statistics/NCHS/Datasets/DVS/mortality/<br/>"
-        "File: mort2023ps.zip (US Territories)",
-        body_style
-    ))
-    elements.append(Spacer(1, 8))
-    elements.append(Paragraph(
-        "References: CDC NVSR 74-04 (drug-induced death codes), CDC NVSR 74-08 (2023 mortality summary)",
-        footnote_style
-    ))
+    validation_table.setStyle(_table_style())
+
+    intro, methodology, footer = _static_flowables()
+    elements = [
+        *map(copy.copy, intro),
+        table,
+        *map(copy.copy, methodology),
+        validation_table,
+        *map(copy.copy, footer),
+    ]
 
     doc.build(elements)
+    with open(pdf_path, 'wb') as f:
+        f.write(buffer.getvalue())
     print(f"Report saved to: {pdf_path}")
 
 
+def create_report():
+    """Generate PDF report, unless it is already up to date."""
+    pdf_path = os.path.join(OUTPUT_DIR, "US_Territory_Mortality_Statistics_2023.pdf")
+    key = output_cache.input_key(__file__, RESULTS, VALIDATION_DATA)
+    if output_cache.is_current(pdf_path, key):
+        print(f"Report up to date: {pdf_path}")
+        return
+    build_mortality_pdf(_RESULTS_TABLE_DATA, _VALIDATION_TABLE_DATA, pdf_path)
+    output_cache.record(pdf_path, key)
+
+
 if __name__ == "__main__":
     create_report()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Split a mortality data file into line-aligned byte ranges so that its
+records can be processed in parallel.
+"""
+
+import os
+
+
+def split_file_ranges(data_file, num_ranges):
+    """
+    Split a file into up to num_ranges byte ranges that each start at the
+    beginning of a line.
+
+    Returns a list of (start, end) offsets covering the whole file.
+    """
+    size = os.path.getsize(data_file)
+    offsets = [0]
+    with open(data_file, 'rb') as f:
+        for i in range(1, num_ranges):
+            # Step back one byte so an offset already at a line start is kept
+            f.seek(max(i * size // num_ranges - 1, offsets[-1]))
+            f.readline()
+            offsets.append(max(f.tell(), offsets[-1]))
+    offsets.append(size)
+
+    return [(lo, hi) for lo, hi in zip(offsets, offsets[1:]) if lo < hi]
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Skip regenerating output files whose inputs have not changed.
+
+Each output file gets a sidecar, output/.hash_<name>, holding the hash of
+the generator source and data it was last built from.
+"""
+
+import hashlib
+from pathlib import Path
+
+
+def input_key(source_file, *inputs):
+    """Hash a generator's source file together with the data it renders."""
+    h = hashlib.blake2b(Path(source_file).read_bytes(), digest_size=16)
+    h.update(repr(inputs).encode())
+    return h.hexdigest()
+
+
+def _hash_file(output_path):
+    output_path = Path(output_path)
+    return output_path.with_name(f".hash_{output_path.name}")
+
+
+def is_current(output_path, key):
+    """True if output_path exists and was last built from inputs hashing to key."""
+    hash_file = _hash_file(output_path)
+    return (Path(output_path).exists() and hash_file.exists()
+            and hash_file.read_text() == key)
+
+
+def record(output_path, key):
+    """Remember that output_path was just built from inputs hashing to key."""
+    _hash_file(output_path).write_text(key)
@@ -4,11 +4,17 @@ Process CDC Mortality Data for US Territories
 Extracts drug-related deaths, overdose deaths, and suicide deaths
 """
 
+import heapq
+import io
 import os
 import re
 import urllib.request
 import zipfile
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+from file_ranges import split_file_ranges
 
 # File paths - relative to project root
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -20,6 +26,9 @@ DATA_FILE = os.path.join(DATA_DIR, "VS23MORT.DPSMCPUB_r20241030")
 CDC_URL = "https://ftp.cdc.gov/pub/Health_Statistics/NCHS/Datasets/DVS/mortality/mort2023ps.zip"
 ZIP_FILE = os.path.join(DATA_DIR, "mort2023ps.zip")
 
+# Read buffer for the data file
+READ_BUFFER_SIZE = 1 << 20  # 1 MB
+
 
 def download_data():
     """Download and extract CDC mortality data if not present."""
@@ -29,12 +38,18 @@ def download_data():
 
     os.makedirs(DATA_DIR, exist_ok=True)
 
-    # Download zip file
-    if not os.path.exists(ZIP_FILE):
+    # Use a zip file already on disk; otherwise download it into memory, so
+    # the ~30MB archive is never written out just to be extracted and deleted
+    if os.path.exists(ZIP_FILE):
+        zip_source = ZIP_FILE
+        downloaded = False
+    else:
         print(f"Downloading CDC mortality data from {CDC_URL}...")
         print("This may take a few minutes (~30MB)...")
         try:
-            urllib.request.urlretrieve(CDC_URL, ZIP_FILE)
+            with urllib.request.urlopen(CDC_URL) as response:
+                zip_source = io.BytesIO(response.read())
+            downloaded = True
             print("Download complete.")
         except Exception as e:
             print(f"Error downloading data: {e}")
@@ -43,12 +58,13 @@ def download_data():
     # Extract zip file
     print("Extracting data...")
     try:
-        with zipfile.ZipFile(ZIP_FILE, 'r') as zip_ref:
+        with zipfile.ZipFile(zip_source, 'r') as zip_ref:
             zip_ref.extractall(DATA_DIR)
         print("Extraction complete.")
 
-        # Clean up zip file
-        os.remove(ZIP_FILE)
+        # Clean up zip file (a downloaded archive was never written to disk)
+        if not downloaded:
+            os.remove(ZIP_FILE)
         return True
     except Exception as e:
         print(f"Error extracting data: {e}")
@@ -63,6 +79,9 @@ TERRITORIES = {
     'MP': 'Northern Mariana Islands'
 }
 
+# Raw state-of-occurrence field for each territory
+TERRITORY_FIELDS = {code.encode('ascii'): code for code in TERRITORIES}
+
 # Manner of Death codes
 MANNER_OF_DEATH = {
     '1': 'Accident',
@@ -75,6 +94,78 @@ MANNER_OF_DEATH = {
     ' ': 'Not specified'
 }
 
+# ICD-10 code prefixes for each category. A code belongs to a category when
+# its first 3 or first 4 characters are in the set, and the classifiers
+# below test exactly that instead of walking the rules one by one.
+
+# X40-X44, X60-X64, X85, Y10-Y14 (any subcategory)
+DRUG_OVERDOSE_PREFIXES = frozenset(
+    [f'X4{d}' for d in '01234'] +
+    [f'X6{d}' for d in '01234'] +
+    ['X85'] +
+    [f'Y1{d}' for d in '01234']
+)
+
+# Overdose codes plus the drug-induced codes from CDC NVSR 74-04
+DRUG_RELATED_PREFIXES = DRUG_OVERDOSE_PREFIXES | frozenset(
+    # D codes - blood disorders
+    ['D521', 'D590', 'D592', 'D611', 'D642'] +
+    # E codes - endocrine disorders
+    ['E064', 'E231', 'E242', 'E273', 'E661'] +
+    # F11-F16, F18-F19: subcategories 1-5, 7, 9; F17 (tobacco): 3-5, 7, 9
+    [f'F1{s}{c}' for s in '12345689' for c in '1234579'] +
+    [f'F17{c}' for c in '34579'] +
+    # G codes - nervous system disorders
+    ['G211', 'G240', 'G251', 'G254', 'G256', 'G444', 'G620', 'G720'] +
+    # I, J, K, L codes - circulatory, respiratory, digestive, skin
+    ['I952', 'J702', 'J703', 'J704', 'K853', 'L105', 'L270', 'L271'] +
+    # M codes - musculoskeletal disorders
+    ['M102', 'M320', 'M804', 'M814', 'M835', 'M871'] +
+    # R codes - symptoms/lab findings
+    ['R502', 'R781', 'R782', 'R783', 'R784', 'R785']
+)
+
+# X60-X84 (intentional self-harm), U03 (terrorism involving suicide),
+# Y87.0 (sequelae of intentional self-harm)
+SUICIDE_PREFIXES = frozenset([f'X{n}' for n in range(60, 85)] + ['U03', 'Y870'])
+
+# Category bits returned by code_flags()
+OVERDOSE_FLAG = 1
+DRUG_RELATED_FLAG = 2
+SUICIDE_FLAG = 4
+
+
+def _build_prefix_flags():
+    """Map every category prefix to the OR of the category bits it carries."""
+    prefix_flags = defaultdict(int)
+    for prefixes, flag in ((DRUG_OVERDOSE_PREFIXES, OVERDOSE_FLAG),
+                           (DRUG_RELATED_PREFIXES, DRUG_RELATED_FLAG),
+                           (SUICIDE_PREFIXES, SUICIDE_FLAG)):
+        for prefix in prefixes:
+            prefix_flags[prefix] |= flag
+    return dict(prefix_flags)
+
+
+PREFIX_FLAGS = _build_prefix_flags()
+
+
+# Flags of every code classified so far, keyed by the code as passed in.
+# A year's file repeats a few hundred distinct codes across all records.
+_CODE_FLAGS_CACHE = {}
+
+
+def code_flags(icd10_code):
+    """
+    Classify an ICD-10 code into all three categories at once.
+    Returns a bitmask of OVERDOSE_FLAG, DRUG_RELATED_FLAG and SUICIDE_FLAG.
+    """
+    flags = _CODE_FLAGS_CACHE.get(icd10_code)
+    if flags is None:
+        code = icd10_code.strip().upper()
+        flags = PREFIX_FLAGS.get(code[:3], 0) | PREFIX_FLAGS.get(code[:4], 0)
+        _CODE_FLAGS_CACHE[icd10_code] = flags
+    return flags
+
 def is_drug_overdose(icd10_code):
     """
     Check if ICD-10 code indicates drug overdose.
@@ -84,33 +175,7 @@ def is_drug_overdose(icd10_code):
     - X85: Assault by drugs, medicaments and biological substances (homicide by drugs)
     - Y10-Y14: Poisoning by drugs, undetermined intent
     """
-    code = icd10_code.strip().upper()
-    if len(code) < 3:
-        return False
-
-    # Check X40-X44 (accidental drug poisoning)
-    if code.startswith('X4') and len(code) >= 3:
-        digit = code[2]
-        if digit in '01234':
-            return True
-
-    # Check X60-X64 (intentional self-poisoning by drugs)
-    if code.startswith('X6') and len(code) >= 3:
-        digit = code[2]
-        if digit in '01234':
-            return True
-
-    # Check X85 (assault/homicide by drugs)
-    if code.startswith('X85'):
-        return True
-
-    # Check Y10-Y14 (undetermined intent drug poisoning)
-    if code.startswith('Y1') and len(code) >= 3:
-        digit = code[2]
-        if digit in '01234':
-            return True
-
-    return False
+    return bool(code_flags(icd10_code) & OVERDOSE_FLAG)
 
 def is_drug_related(icd10_code):
     """
@@ -129,131 +194,7 @@ def is_drug_related(icd10_code):
 
     NOTE: Does NOT include T36-T50 (poisoning codes) per Connor's list.
     """
-    code = icd10_code.strip().upper()
-    if len(code) < 3:
-        return False
-
-    # Drug overdose codes (includes X85 for assault by drugs)
-    if is_drug_overdose(icd10_code):
-        return True
-
-    # D codes - blood disorders: D52.1, D59.0, D59.2, D61.1, D64.2
-    if code.startswith('D521') or code == 'D521':
-        return True
-    if code.startswith('D590') or code == 'D590':
-        return True
-    if code.startswith('D592') or code == 'D592':
-        return True
-    if code.startswith('D611') or code == 'D611':
-        return True
-    if code.startswith('D642') or code == 'D642':
-        return True
-
-    # E codes - endocrine disorders: E06.4, E23.1, E24.2, E27.3, E66.1
-    if code.startswith('E064') or code == 'E064':
-        return True
-    if code.startswith('E231') or code == 'E231':
-        return True
-    if code.startswith('E242') or code == 'E242':
-        return True
-    if code.startswith('E273') or code == 'E273':
-        return True
-    if code.startswith('E661') or code == 'E661':
-        return True
-
-    # F codes - Mental and behavioral disorders due to psychoactive substance use
-    # F11-F16, F18-F19: subcategories .1-.5, .7-.9 (NOT .0, .6)
-    # F17 (tobacco): ONLY .3-.5, .7-.9 (NOT .0, .1, .2, .6)
-    if code.startswith('F1') and len(code) >= 4:
-        substance_digit = code[2]
-        subcat = code[3]
-
-        # F11-F16, F18-F19: .1-.5, .7-.9
-        if substance_digit in '1234568' and substance_digit != '0':
-            if subcat in '1234579':
-                return True
-
-        # F17 (tobacco): ONLY .3-.5, .7-.9
-        if substance_digit == '7':
-            if subcat in '34579':
-                return True
-
-        # F19: .1-.5, .7-.9
-        if substance_digit == '9':
-            if subcat in '1234579':
-                return True
-
-    # G codes - nervous system disorders: G21.1, G24.0, G25.1, G25.4, G25.6, G44.4, G62.0, G72.0
-    if code.startswith('G211') or code == 'G211':
-        return True
-    if code.startswith('G240') or code == 'G240':
-        return True
-    if code.startswith('G251') or code == 'G251':
-        return True
-    if code.startswith('G254') or code == 'G254':
-        return True
-    if code.startswith('G256') or code == 'G256':
-        return True
-    if code.startswith('G444') or code == 'G444':
-        return True
-    if code.startswith('G620') or code == 'G620':
-        return True
-    if code.startswith('G720') or code == 'G720':
-        return True
-
-    # I codes - circulatory: I95.2
-    if code.startswith('I952') or code == 'I952':
-        return True
-
-    # J codes - respiratory: J70.2, J70.3, J70.4
-    if code.startswith('J702') or code == 'J702':
-        return True
-    if code.startswith('J703') or code == 'J703':
-        return True
-    if code.startswith('J704') or code == 'J704':
-        return True
-
-    # K codes - digestive: K85.3
-    if code.startswith('K853') or code == 'K853':
-        return True
-
-    # L codes - skin: L10.5, L27.0, L27.1
-    if code.startswith('L105') or code == 'L105':
-        return True
-    if code.startswith('L270') or code == 'L270':
-        return True
-    if code.startswith('L271') or code == 'L271':
-        return True
-
-    # M codes - musculoskeletal: M10.2, M32.0, M80.4, M81.4, M83.5, M87.1
-    if code.startswith('M102') or code == 'M102':
-        return True
-    if code.startswith('M320') or code == 'M320':
-        return True
-    if code.startswith('M804') or code == 'M804':
-        return True
-    if code.startswith('M814') or code == 'M814':
-        return True
-    if code.startswith('M835') or code == 'M835':
-        return True
-    if code.startswith('M871') or code == 'M871':
-        return True
-
-    # R codes - symptoms/lab: R50.2, R78.1, R78.2, R78.3, R78.4, R78.5
-    if code.startswith('R502') or code == 'R502':
-        return True
-    if code.startswith('R781') or code == 'R781':
-        return True
-    if code.startswith('R782') or code == 'R782':
-        return True
-    if code.startswith('R783') or code == 'R783':
-        return True
-    if code.startswith('R784') or code == 'R784':
-        return True
-    if code.startswith('R785') or code == 'R785':
-        return True
-
-    return False
+    return bool(code_flags(icd10_code) & DRUG_RELATED_FLAG)
 
 def is_suicide_code(icd10_code):
     """
@@ -262,28 +203,7 @@ def is_suicide_code(icd10_code):
     - U03: Terrorism involving suicide
     - Y87.0: Sequelae of intentional self-harm
     """
-    code = icd10_code.strip().upper()
-    if len(code) < 3:
-        return False
-
-    # X60-X84: Intentional self-harm
-    if code.startswith('X'):
-        try:
-            num = int(code[1:3])
-            if 60 <= num <= 84:
-                return True
-        except ValueError:
-            pass
-
-    # U03: Terrorism involving suicide
-    if code.startswith('U03'):
-        return True
-
-    # Y87.0: Sequelae of intentional self-harm
-    if code.startswith('Y870'):
-        return True
-
-    return False
+    return bool(code_flags(icd10_code) & SUICIDE_FLAG)
 
 
 def is_suicide(manner_code, icd10_code):
@@ -300,6 +220,10 @@ def is_suicide(manner_code, icd10_code):
     return is_suicide_code(icd10_code)
 
 
+# Start of each record-axis condition (0-indexed: position 344 = index 343)
+RECORD_AXIS_STARTS = tuple(range(343, 443, 5))
+
+
 def extract_multiple_causes(line):
     """
     Extract all causes of death from record-axis conditions.
@@ -311,26 +235,16 @@ def extract_multiple_causes(line):
 
     Returns list of ICD-10 codes.
     """
-    causes = []
-
     if len(line) < 443:
-        return causes
+        return []
 
-    try:
-        num_conditions = int(line[340:342].strip() or '0')
-    except ValueError:
-        num_conditions = 0
+    # Space-padded count; anything other than plain digits counts as none
+    count_field = line[340:342].strip()
+    num_conditions = int(count_field) if count_field.isdecimal() else 0
 
-    # Extract each condition (max 20)
-    for i in range(min(num_conditions, 20)):
-        start = 343 + (i * 5)  # 0-indexed: position 344 = index 343
-        end = start + 4
-        if end <= len(line):
-            code = line[start:end].strip()
-            if code:
-                causes.append(code)
-
-    return causes
+    # Extract each condition (max 20), skipping blank ones
+    return [code for start in RECORD_AXIS_STARTS[:num_conditions]
+            if (code := line[start:start + 4].strip())]
 
 
 def check_any_cause(icd_codes, check_function):
@@ -343,57 +257,72 @@ def check_any_cause(icd_codes, check_function):
     return False
 
 
-def process_mortality_data(use_multiple_causes=True):
+# Per-territory death counters, in the order the stats dicts list them.
+# The record loop keeps them in a flat list indexed by these positions.
+STAT_COUNTERS = (
+    'total_deaths', 'suicide_deaths', 'drug_overdose_deaths', 'drug_related_deaths',
+    'accidental_deaths', 'homicide_deaths', 'natural_deaths'
+)
+(_TOTAL, _SUICIDE, _OVERDOSE, _DRUG_RELATED,
+ _ACCIDENTAL, _HOMICIDE, _NATURAL) = range(len(STAT_COUNTERS))
+
+# Manner of death codes with their own counter
+_MANNER_COUNTERS = {'1': _ACCIDENTAL, '3': _HOMICIDE, '7': _NATURAL}
+
+
+def tally_range(data_file, start, end, use_multiple_causes=True):
     """
-    Process the mortality data file and calculate statistics.
+    Tally territory records in bytes [start, end) of data_file.
 
-    Args:
-        use_multiple_causes: If True, check both underlying and contributing causes.
-                           If False, only check underlying cause (position 146-149).
+    The range must hold whole lines (see split_file_ranges).
+    Returns (tallies, total_records) for the records in the range.
     """
 
-    stats = defaultdict(lambda: {
-        'total_deaths': 0,
-        'suicide_deaths': 0,
-        'drug_overdose_deaths': 0,
-        'drug_related_deaths': 0,
-        'accidental_deaths': 0,
-        'homicide_deaths': 0,
-        'natural_deaths': 0,
-        'icd10_codes': defaultdict(int),
-        'multiple_cause_codes': defaultdict(int)
-    })
+    # territory -> (counters, underlying cause histogram, all-causes histogram)
+    tallies = {}
 
     total_records = 0
 
-    with open(DATA_FILE, 'r', encoding='latin-1') as f:
+    # Read raw bytes; only territory records are decoded (latin-1)
+    with open(data_file, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        f.seek(start)
+        remaining = end - start
         for line in f:
+            if remaining <= 0:
+                break
+            remaining -= len(line)
+
             if len(line) < 150:
                 continue
 
-            # Extract fields (0-indexed, positions from documentation are 1-indexed)
-            state_occurrence = line[20:22].strip()  # Position 21-22
-            state_residence = line[28:30].strip()   # Position 29-30
-            resident_status = line[19:20]           # Position 20: Resident status
-            manner_of_death = line[106:107]         # Position 107
-            underlying_cause = line[145:149].strip()  # Position 146-149 (underlying cause)
+            # Extract fields (0-indexed, positions from documentation are 1-indexed).
+            # Use state of occurrence for statistics (matches CDC VSRR methodology).
+            # Territory codes are exactly 2 letters, so the raw slice is compared
+            # and every other field is read only for territory records.
+            territory = TERRITORY_FIELDS.get(line[20:22])  # Position 21-22
 
-            # Use state of occurrence for statistics (matches CDC VSRR methodology)
-            territory = state_occurrence
-
-            if territory not in TERRITORIES:
+            if territory is None:
                 continue
 
             # Exclude foreign residents (resident_status = 4) to match CDC WONDER methodology
             # Foreign residents = deaths occurring in US where decedent resided outside US
-            if resident_status == '4':
+            if line[19:20] == b'4':                 # Position 20: Resident status
                 continue
 
+            line = line.decode('latin-1')
+            manner_of_death = line[106:107]         # Position 107
+            underlying_cause = line[145:149].strip()  # Position 146-149 (underlying cause)
+
+            tally = tallies.get(territory)
+            if tally is None:
+                tally = tallies[territory] = ([0] * len(STAT_COUNTERS), Counter(), Counter())
+            counts, icd10_codes, multiple_cause_codes = tally
+
             total_records += 1
-            stats[territory]['total_deaths'] += 1
+            counts[_TOTAL] += 1
 
             # Track underlying cause ICD-10 code
-            stats[territory]['icd10_codes'][underlying_cause] += 1
+            icd10_codes[underlying_cause] += 1
 
             # Get all causes (underlying + contributing) if enabled
             if use_multiple_causes:
@@ -403,33 +332,74 @@ def process_mortality_data(use_multiple_causes=True):
                     all_causes.insert(0, underlying_cause)
 
                 # Track all multiple causes
-                for code in all_causes:
-                    stats[territory]['multiple_cause_codes'][code] += 1
+                multiple_cause_codes.update(all_causes)
             else:
                 all_causes = [underlying_cause] if underlying_cause else []
 
+            # Classify every cause in a single pass, collecting the category bits
+            cause_flags = 0
+            for code in all_causes:
+                cause_flags |= code_flags(code)
+
             # Check for suicide (manner of death OR any cause code)
-            is_suicide_death = manner_of_death == '2'
-            if not is_suicide_death:
-                is_suicide_death = check_any_cause(all_causes, is_suicide_code)
-            if is_suicide_death:
-                stats[territory]['suicide_deaths'] += 1
+            if manner_of_death == '2' or cause_flags & SUICIDE_FLAG:
+                counts[_SUICIDE] += 1
 
             # Check for drug overdose (any cause)
-            if check_any_cause(all_causes, is_drug_overdose):
-                stats[territory]['drug_overdose_deaths'] += 1
+            if cause_flags & OVERDOSE_FLAG:
+                counts[_OVERDOSE] += 1
 
             # Check for drug-related (any cause, broader category)
-            if check_any_cause(all_causes, is_drug_related):
-                stats[territory]['drug_related_deaths'] += 1
+            if cause_flags & DRUG_RELATED_FLAG:
+                counts[_DRUG_RELATED] += 1
 
             # Track manner of death
-            if manner_of_death == '1':
-                stats[territory]['accidental_deaths'] += 1
-            elif manner_of_death == '3':
-                stats[territory]['homicide_deaths'] += 1
-            elif manner_of_death == '7':
-                stats[territory]['natural_deaths'] += 1
+            manner_counter = _MANNER_COUNTERS.get(manner_of_death)
+            if manner_counter is not None:
+                counts[manner_counter] += 1
+
+    return tallies, total_records
+
+
+def process_mortality_data(use_multiple_causes=True):
+    """
+    Process the mortality data file and calculate statistics.
+
+    Args:
+        use_multiple_causes: If True, check both underlying and contributing causes.
+                           If False, only check underlying cause (position 146-149).
+    """
+
+    # Records are independent, so tally line-aligned byte ranges in parallel
+    ranges = split_file_ranges(DATA_FILE, os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max(len(ranges), 1)) as executor:
+        futures = [
+            executor.submit(tally_range, DATA_FILE, lo, hi, use_multiple_causes)
+            for lo, hi in ranges
+        ]
+
+        # Merge in file order, so territories and codes keep their first-seen order
+        tallies = {}
+        total_records = 0
+        for future in futures:
+            range_tallies, range_records = future.result()
+            total_records += range_records
+            for territory, (counts, icd10_codes, multiple_cause_codes) in range_tallies.items():
+                if territory not in tallies:
+                    tallies[territory] = (counts, icd10_codes, multiple_cause_codes)
+                    continue
+                merged_counts, merged_icd10, merged_multiple = tallies[territory]
+                for i, count in enumerate(counts):
+                    merged_counts[i] += count
+                merged_icd10.update(icd10_codes)
+                merged_multiple.update(multiple_cause_codes)
+
+    # Rebuild the per-territory stats dicts from the flat counters
+    stats = {}
+    for territory, (counts, icd10_codes, multiple_cause_codes) in tallies.items():
+        stats[territory] = dict(zip(STAT_COUNTERS, counts))
+        stats[territory]['icd10_codes'] = icd10_codes
+        stats[territory]['multiple_cause_codes'] = multiple_cause_codes
 
     return stats, total_records
 
@@ -442,6 +412,11 @@ def print_statistics(stats, total_records):
     print(f"\nTotal records processed: {total_records:,}")
     print()
 
+    # Classify each distinct underlying cause once, across all territories
+    # (drug-related codes include every overdose code)
+    seen_codes = set().union(*(data['icd10_codes'] for data in stats.values()))
+    drug_related_codes = {code for code in seen_codes if code_flags(code) & DRUG_RELATED_FLAG}
+
     for territory_code in ['PR', 'GU', 'VI', 'AS', 'MP']:
         if territory_code not in stats:
             print(f"\n{TERRITORIES[territory_code]}: No data found")
@@ -462,14 +437,12 @@ def print_statistics(stats, total_records):
         print(f"  Natural Deaths:       {data['natural_deaths']:,}")
 
         # Show top ICD-10 codes for drug-related deaths
-        drug_codes = {}
-        for code, count in data['icd10_codes'].items():
-            if is_drug_related(code) or is_drug_overdose(code):
-                drug_codes[code] = count
+        drug_codes = {code: count for code, count in data['icd10_codes'].items()
+                      if code in drug_related_codes}
 
         if drug_codes:
             print(f"\n  Drug-Related ICD-10 Codes:")
-            for code, count in sorted(drug_codes.items(), key=lambda x: -x[1])[:10]:
+            for code, count in heapq.nlargest(10, drug_codes.items(), key=itemgetter(1)):
                 print(f"    {code}: {count}")
         print()
 